@@ -1,8 +1,19 @@
+import array
+import collections
+import re
+
+import functools as ft
+
 from builtins import hasattr, getattr, setattr, delattr
 from operator import attrgetter, itemgetter
 
 from . import utilities
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 Create = utilities.unique_instance("Create")
 Update = utilities.unique_instance("Update")
 Delete = utilities.unique_instance("Delete")
@@ -60,31 +71,27 @@ def lenitems(obj):
 
 def getpath(getter):
     def _getpath(obj, path):
-        if len(path) > 0:
-            head, *tail = path
-            return _getpath(getter(obj, head), tail)
-        else:
-            return obj
+        for key in path:
+            obj = getter(obj, key)
+        return obj
     return _getpath
 
 
 def setpath(getter, setter):
     def _setpath(obj, path, value):
-        if len(path) > 1:
-            head, *tail = path
-            _setpath(getter(obj, head), tail, value)
-        else:
-            setter(obj, path, value)
+        *head, last = path
+        for key in head:
+            obj = getter(obj, key)
+        setter(obj, last, value)
     return _setpath
 
 
 def delpath(getter, deleter):
-    def _delpath(obj, path, value):
-        if len(path) > 1:
-            head, *tail = path
-            _delpath(getter(obj, head), tail)
-        else:
-            deleter(obj, path)
+    def _delpath(obj, path):
+        *head, last = path
+        for key in head:
+            obj = getter(obj, key)
+        deleter(obj, last)
     return _delpath
 
 
@@ -97,6 +104,136 @@ setitempath = setpath(getitem, setitem)
 delitempath = delpath(getitem, delitem)
 
 
+_PATH_TOKEN = re.compile(r"""(?:^|\.)([^.\[\]]+)|\[([^\]]*)\]""")
+
+
+def _parse_key(key):
+    if re.match(r"^-?\d+$", key):
+        return int(key)
+    if len(key) > 1 and key[0] == key[-1] and key[0] in "'\"":
+        return key[1:-1]
+    return key
+
+
+def parse_path(path):
+    if not isinstance(path, str):
+        # Tuple paths are item keys, as for getitempath; use a string path to mix in attributes.
+        steps = tuple((True, step) for step in path)
+        if not steps:
+            raise ValueError("Invalid path: {!r}".format(path))
+        return steps
+    
+    steps = []
+    position = 0
+    for match in _PATH_TOKEN.finditer(path):
+        if match.start() != position or match.group().startswith(".") and position == 0:
+            break
+        attr, item = match.groups()
+        steps.append((False, attr) if item is None else (True, _parse_key(item)))
+        position = match.end()
+    if position != len(path) or not steps:
+        raise ValueError("Invalid path: {!r}".format(path))
+    return tuple(steps)
+
+
+def _path_getters(steps):
+    getters = []
+    attrs = []
+    for is_item, key in steps:
+        if is_item:
+            if attrs:
+                getters.append(attrgetter(".".join(attrs)))
+                attrs = []
+            getters.append(itemgetter(key))
+        else:
+            attrs.append(key)
+    if attrs:
+        getters.append(attrgetter(".".join(attrs)))
+    return tuple(getters)
+
+
+class CompiledPath(object):
+    def __init__(self, steps):
+        super().__init__()
+        
+        self.steps = steps
+        self._getters = _path_getters(steps)
+        self._parent = _path_getters(steps[:-1])
+        self._is_item, self._key = steps[-1]
+    
+    def get(self, obj, default=utilities.Unspecified):
+        try:
+            for getter in self._getters:
+                obj = getter(obj)
+        except AttrErrors + ItemErrors:
+            if utilities.specified(default):
+                return default
+            raise
+        return obj
+    
+    def set(self, obj, value):
+        for getter in self._parent:
+            obj = getter(obj)
+        if self._is_item:
+            obj[self._key] = value
+        else:
+            setattr(obj, self._key, value)
+    
+    def delete(self, obj):
+        for getter in self._parent:
+            obj = getter(obj)
+        if self._is_item:
+            delitem(obj, self._key)
+        else:
+            delattr(obj, self._key)
+    
+    def __call__(self, obj, default=utilities.Unspecified):
+        return self.get(obj, default)
+    
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.steps)
+
+
+@ft.lru_cache(maxsize=1024)
+def _compile_path(path):
+    return CompiledPath(parse_path(path))
+
+
+def compile_path(path):
+    try:
+        return _compile_path(path)
+    except TypeError:
+        return CompiledPath(parse_path(path))
+
+
+def _column(values, use_numpy):
+    types = set(map(type, values))
+    if types and types <= {int, float}:
+        if use_numpy:
+            return numpy.asarray(values)
+        try:
+            return array.array("q" if types == {int} else "d", values)
+        except OverflowError:
+            pass
+    return values
+
+
+def project(objects, paths, default=None, use_numpy=None):
+    if isinstance(paths, collections.Mapping):
+        names, paths = list(paths.keys()), list(paths.values())
+    else:
+        names = paths = list(paths)
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    
+    columns = [[] for _ in paths]
+    getters = [(column.append, compile_path(path).get) for column, path in zip(columns, paths)]
+    for obj in objects:
+        for append, get in getters:
+            append(get(obj, default))
+    return {name: _column(column, use_numpy) for name, column in zip(names, columns)}
+
+
 def attrsetter(key, obj=utilities.Unspecified):
     def f0(value):
         setattr(obj, key, value)
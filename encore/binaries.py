@@ -0,0 +1,376 @@
+import array
+import struct
+import sys
+
+import itertools as it
+
+from . import objects
+
+
+_BINARY_MAGIC = b"ENCB\x01"
+
+_TAG_NONE, _TAG_FALSE, _TAG_TRUE = b"N", b"F", b"T"
+_TAG_INT, _TAG_BIGINT, _TAG_FLOAT = b"i", b"I", b"d"
+_TAG_STR, _TAG_STR_DEF, _TAG_STR_REF = b"s", b"S", b"R"
+_TAG_LIST, _TAG_ARRAY, _TAG_MAP = b"L", b"A", b"M"
+_TAG_TABLE, _TAG_CONST = b"X", b"C"
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+_LIST, _MAP, _TABLE, _CONST = range(4)
+
+_u32 = struct.Struct("<I")
+_i64 = struct.Struct("<q")
+_f64 = struct.Struct("<d")
+
+_tagged_u32 = struct.Struct("<cI")
+_tagged_u32_u32 = struct.Struct("<cII")
+_tagged_i64 = struct.Struct("<cq")
+_tagged_f64 = struct.Struct("<cd")
+
+_CONST_TYPES = (str, int, float, bool, type(None))
+
+
+def _array_to_bytes(values):
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _array_from_bytes(typecode, data):
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+
+class ObjectBinaryEncoder(object):
+    """
+    Length-prefixed binary encoding of raw Object trees; keys and short strings are written once and referenced by index.
+    Lists of maps sharing the same keys are written as tables of columns, numeric columns as packed arrays and repeated values once.
+    """
+    
+    def __init__(self, intern_size=64):
+        super().__init__()
+        
+        self.intern_size = intern_size
+    
+    def encode(self, obj):
+        buffer = bytearray(_BINARY_MAGIC)
+        write = buffer.extend
+        # Interned strings map to their packed reference, so repeated keys cost a single write.
+        strings = {}
+        intern_size = self.intern_size
+        pack_u32 = _tagged_u32.pack
+        pack_i64 = _tagged_i64.pack
+        pack_f64 = _tagged_f64.pack
+        Object = objects.Object
+        
+        def _encode_str(value, intern):
+            reference = strings.get(value)
+            if reference is not None:
+                write(reference)
+                return
+            data = value.encode("utf-8")
+            if intern or len(value) <= intern_size:
+                strings[value] = pack_u32(_TAG_STR_REF, len(strings))
+                write(pack_u32(_TAG_STR_DEF, len(data)))
+            else:
+                write(pack_u32(_TAG_STR, len(data)))
+            write(data)
+        
+        def _encode_other(value, type_):
+            if value is None:
+                write(_TAG_NONE)
+            elif value is True:
+                write(_TAG_TRUE)
+            elif value is False:
+                write(_TAG_FALSE)
+            elif isinstance(value, Object):
+                _encode(value._data)
+            elif isinstance(value, objects.View):
+                _encode(objects.dataof(value))
+            elif isinstance(value, int):
+                if _INT64_MIN <= value <= _INT64_MAX:
+                    write(pack_i64(_TAG_INT, value))
+                else:
+                    data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+                    write(pack_u32(_TAG_BIGINT, len(data)))
+                    write(data)
+            elif isinstance(value, float):
+                write(pack_f64(_TAG_FLOAT, value))
+            elif isinstance(value, str):
+                _encode_str(str(value), False)
+            elif objects.is_mapping(value):
+                _encode_map(value)
+            elif objects.is_sequence(value):
+                _encode_list(value)
+            else:
+                raise ValueError(type_.__name__)
+        
+        def _encode_map(value):
+            write(pack_u32(_TAG_MAP, len(value)))
+            for key, item in value.items():
+                if type(key) is str:
+                    reference = strings.get(key)
+                    if reference is not None:
+                        write(reference)
+                    else:
+                        _encode_str(key, True)
+                elif isinstance(key, str):
+                    _encode_str(str(key), True)
+                else:
+                    _encode(key)
+                _encode(item)
+        
+        def _encode_table(rows):
+            keys = tuple(rows[0])
+            if not all(type(key) is str for key in keys):
+                return False
+            for row in rows:
+                if type(row) is not dict or len(row) != len(keys) or tuple(row) != keys:
+                    return False
+            write(_tagged_u32_u32.pack(_TAG_TABLE, len(rows), len(keys)))
+            for key in keys:
+                _encode_str(key, True)
+            for key in keys:
+                _encode_list([row[key] for row in rows])
+            return True
+        
+        def _encode_list(value):
+            if len(value) > 1:
+                items = [item._data if type(item) is Object else item for item in value]
+                first = items[0]
+                type_ = type(first)
+                if type_ is dict:
+                    if _encode_table(items):
+                        return
+                elif type_ is float and all(type(item) is float for item in items):
+                    data = _array_to_bytes(array.array("d", items))
+                    write(_TAG_ARRAY)
+                    write(pack_u32(b"d", len(data)))
+                    write(data)
+                    return
+                elif type_ is int and all(type(item) is int and _INT64_MIN <= item <= _INT64_MAX for item in items):
+                    data = _array_to_bytes(array.array("q", items))
+                    write(_TAG_ARRAY)
+                    write(pack_u32(b"q", len(data)))
+                    write(data)
+                    return
+                if type_ in _CONST_TYPES and all(type(item) is type_ and item == first for item in items):
+                    write(pack_u32(_TAG_CONST, len(items)))
+                    _encode(first)
+                    return
+                value = items
+            write(pack_u32(_TAG_LIST, len(value)))
+            for item in value:
+                _encode(item)
+        
+        def _encode(value):
+            type_ = type(value)
+            if type_ is float:
+                write(pack_f64(_TAG_FLOAT, value))
+            elif type_ is str:
+                reference = strings.get(value)
+                if reference is not None:
+                    write(reference)
+                else:
+                    _encode_str(value, False)
+            elif type_ is int and _INT64_MIN <= value <= _INT64_MAX:
+                write(pack_i64(_TAG_INT, value))
+            elif type_ is dict:
+                _encode_map(value)
+            elif type_ is list:
+                _encode_list(value)
+            elif type_ is Object:
+                _encode(value._data)
+            else:
+                _encode_other(value, type_)
+        
+        _encode(obj)
+        return bytes(buffer)
+
+
+_NO_KEY = object()
+
+
+class ObjectBinaryDecoder(object):
+    def __init__(self, object_hook=None):
+        super().__init__()
+        
+        self.object_hook = (lambda data: objects.Object(data=data)) if object_hook is None else object_hook
+    
+    def decode(self, data):
+        data = bytes(data)
+        if data[:len(_BINARY_MAGIC)] != _BINARY_MAGIC:
+            raise ValueError("Invalid binary header")
+        try:
+            result, pos = self._decode(data, len(_BINARY_MAGIC))
+        except (struct.error, IndexError):
+            pos = len(data) + 1
+        if pos > len(data):
+            raise ValueError("Truncated binary data")
+        if pos != len(data):
+            raise ValueError("Extra data at {}".format(pos))
+        return result
+    
+    def _decode(self, data, pos):
+        # Iterative: containers are kept on an explicit stack instead of one Python frame per value.
+        strings = []
+        object_hook = self.object_hook
+        u32 = _u32.unpack_from
+        i64 = _i64.unpack_from
+        f64 = _f64.unpack_from
+        STR_REF, STR, STR_DEF = _TAG_STR_REF[0], _TAG_STR[0], _TAG_STR_DEF[0]
+        INT, BIGINT, FLOAT = _TAG_INT[0], _TAG_BIGINT[0], _TAG_FLOAT[0]
+        MAP, LIST, ARRAY = _TAG_MAP[0], _TAG_LIST[0], _TAG_ARRAY[0]
+        TABLE, CONST = _TAG_TABLE[0], _TAG_CONST[0]
+        NONE, TRUE, FALSE = _TAG_NONE[0], _TAG_TRUE[0], _TAG_FALSE[0]
+        
+        def _read_str(pos):
+            tag = data[pos]
+            if tag == STR_REF:
+                return strings[u32(data, pos + 1)[0]], pos + 5
+            if tag != STR_DEF and tag != STR:
+                raise ValueError("Invalid binary table key at {}".format(pos))
+            n = u32(data, pos + 1)[0]
+            pos += 5
+            if pos + n > len(data):
+                raise IndexError(pos)
+            value = data[pos:pos + n].decode("utf-8")
+            if tag == STR_DEF:
+                strings.append(value)
+            return value, pos + n
+        
+        stack = []
+        container, remaining, kind, key, extra = [], 1, _LIST, _NO_KEY, None
+        while True:
+            tag = data[pos]
+            pos += 1
+            if tag == STR_REF:
+                value = strings[u32(data, pos)[0]]
+                pos += 4
+            elif tag == FLOAT:
+                value = f64(data, pos)[0]
+                pos += 8
+            elif tag == INT:
+                value = i64(data, pos)[0]
+                pos += 8
+            elif tag == MAP or tag == LIST:
+                n = u32(data, pos)[0]
+                pos += 4
+                if n:
+                    stack.append((container, remaining, kind, key, extra))
+                    container, remaining, key, extra = ({} if tag == MAP else []), n, _NO_KEY, None
+                    kind = _MAP if tag == MAP else _LIST
+                    continue
+                value = object_hook({}) if tag == MAP else []
+            elif tag == ARRAY:
+                typecode = data[pos:pos + 1].decode("ascii")
+                n = u32(data, pos + 1)[0]
+                pos += 5
+                if pos + n > len(data):
+                    raise IndexError(pos)
+                value = _array_from_bytes(typecode, data[pos:pos + n])
+                pos += n
+            elif tag == TABLE:
+                n, k = u32(data, pos)[0], u32(data, pos + 4)[0]
+                pos += 8
+                keys = []
+                for _ in range(k):
+                    name, pos = _read_str(pos)
+                    keys.append(name)
+                if k:
+                    stack.append((container, remaining, kind, key, extra))
+                    container, remaining, kind, key, extra = [], k, _TABLE, _NO_KEY, (n, tuple(keys))
+                    continue
+                value = [object_hook({}) for _ in range(n)]
+            elif tag == CONST:
+                n = u32(data, pos)[0]
+                pos += 4
+                stack.append((container, remaining, kind, key, extra))
+                container, remaining, kind, key, extra = [], 1, _CONST, _NO_KEY, n
+                continue
+            elif tag == STR_DEF or tag == STR:
+                value, pos = _read_str(pos - 1)
+            elif tag == NONE:
+                value = None
+            elif tag == TRUE:
+                value = True
+            elif tag == FALSE:
+                value = False
+            elif tag == BIGINT:
+                n = u32(data, pos)[0]
+                pos += 4
+                if pos + n > len(data):
+                    raise IndexError(pos)
+                value = int.from_bytes(data[pos:pos + n], "little", signed=True)
+                pos += n
+            else:
+                raise ValueError("Invalid binary tag {!r} at {}".format(bytes([tag]), pos - 1))
+            
+            while True:
+                if kind == _MAP:
+                    if key is _NO_KEY:
+                        key = value
+                        break
+                    container[key] = value
+                    key = _NO_KEY
+                else:
+                    container.append(value)
+                remaining -= 1
+                if remaining:
+                    break
+                if not stack:
+                    return container[0], pos
+                if kind == _LIST:
+                    value = container
+                elif kind == _MAP:
+                    value = object_hook(container)
+                elif kind == _TABLE:
+                    n, keys = extra
+                    if any(len(column) != n for column in container):
+                        raise ValueError("Invalid binary table at {}".format(pos))
+                    value = list(map(object_hook, map(dict, map(zip, it.repeat(keys, n), zip(*container)))))
+                else:
+                    value = container * extra
+                container, remaining, kind, key, extra = stack.pop()
+
+
+def save_binary_raw(data, *args, **kwargs):
+    return ObjectBinaryEncoder(*args, **kwargs).encode(data)
+
+
+def load_binary_raw(data, *args, **kwargs):
+    return ObjectBinaryDecoder(*args, **kwargs).decode(data)
+
+
+def save_binary(value, codec, *args, shared=False, **kwargs):
+    with objects.shared_encoding(shared):
+        data = codec.encode(value)
+    return save_binary_raw(data, *args, **kwargs)
+
+
+def load_binary(data, codec, *args, shared=False, **kwargs):
+    value = load_binary_raw(data, *args, **kwargs)
+    with objects.shared_decoding(value, shared):
+        return codec.decode(value)
+
+
+def save_binary_file(value, file, codec, *args, **kwargs):
+    return file.write(save_binary(value, codec, *args, **kwargs))
+
+
+def load_binary_file(file, codec, *args, **kwargs):
+    return load_binary(file.read(), codec, *args, **kwargs)
+
+
+def save_binary_path(path, data, codec, *args, **kwargs):
+    with open(path, 'wb') as file:
+        return save_binary_file(data, file, codec, *args, **kwargs)
+
+
+def load_binary_path(path, codec, *args, **kwargs):
+    with open(path, 'rb') as file:
+        return load_binary_file(file, codec, *args, **kwargs)
@@ -1,6 +1,8 @@
 import collections
 
-from . import accessors, iterables
+import itertools as it
+
+from . import accessors, defaults, iterables, utilities
 
 
 def is_ordered(container):
@@ -8,6 +10,8 @@ def is_ordered(container):
 
 
 def iterkeys(container):
+    if isinstance(container, IndexedView):
+        return container.keys()
     def _iterkeys(container):
         if isinstance(container, collections.Sequence):
             return iter(range(len(container)))
@@ -29,6 +33,8 @@ def iteritems(container):
 
 
 def index(container, key):
+    if isinstance(container, IndexedView):
+        return container.index(key)
     if isinstance(container, collections.Sequence):
         return key
     if isinstance(container, collections.Mapping):
@@ -36,6 +42,8 @@ def index(container, key):
 
 
 def key(container, index):
+    if isinstance(container, IndexedView):
+        return container.key(index)
     if isinstance(container, collections.Sequence):
         return index
     if isinstance(container, collections.Mapping):
@@ -43,6 +51,8 @@ def key(container, index):
 
 
 def insert(container, key, value):
+    if isinstance(container, IndexedView):
+        return container.insert(key, value)
     if isinstance(container, collections.MutableMapping):
         return accessors.setitem(container, key, value)
     if isinstance(container, collections.MutableSequence):
@@ -53,4 +63,339 @@ def insert(container, key, value):
 
 
 def remove(container, key):
+    if isinstance(container, IndexedView):
+        return container.remove(key)
     return accessors.delitem(container, key)
+
+
+class _Counts(object):
+    """
+    Fenwick tree over per-slot counts.
+    """
+    
+    def __init__(self, counts=()):
+        super().__init__()
+        
+        tree = [0] + list(counts)
+        for i in range(1, len(tree)):
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+    
+    def add(self, slot, delta):
+        tree = self._tree
+        i = slot + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+    
+    def append(self, count):
+        i = len(self._tree)
+        self._tree.append(count + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+    
+    def prefix(self, slot):
+        tree = self._tree
+        total = 0
+        while slot > 0:
+            total += tree[slot]
+            slot -= slot & -slot
+        return total
+    
+    def find(self, count):
+        tree = self._tree
+        slot = 0
+        step = 1 << (len(tree).bit_length() - 1)
+        while step:
+            following = slot + step
+            if following < len(tree) and tree[following] <= count:
+                slot = following
+                count -= tree[following]
+            step >>= 1
+        return slot
+
+
+_Removed = utilities.unique_instance("Removed", False)
+
+
+class IndexedView(object):
+    """
+    Keeps the key order of a container and a key to slot map, updated by insert and remove.
+    Removed keys leave a tombstone counted out through a Fenwick tree, so index and key stay O(log n) until the slots are compacted.
+    Call invalidate after mutating the underlying container directly.
+    """
+    
+    def __init__(self, container):
+        super().__init__()
+        
+        self.container = container
+        self.invalidate()
+    
+    def invalidate(self):
+        self._keys = None
+        self._positions = None
+        self._counts = None
+        self._count = 0
+    
+    def _ensure(self):
+        if self._keys is None or self._count != len(self.container):
+            self._keys = list(iterkeys(self.container))
+            self._positions = {key: position for position, key in enumerate(self._keys)}
+            self._counts = _Counts([1] * len(self._keys))
+            self._count = len(self._keys)
+        return self._keys
+    
+    def keys(self):
+        return (key for key in self._ensure() if key is not _Removed)
+    
+    def values(self):
+        container = self.container
+        return (accessors.getitem(container, key) for key in self.keys())
+    
+    def items(self):
+        container = self.container
+        return ((key, accessors.getitem(container, key)) for key in self.keys())
+    
+    def index(self, key):
+        if isinstance(self.container, collections.Sequence):
+            return key
+        self._ensure()
+        try:
+            return self._counts.prefix(self._positions[key])
+        except KeyError:
+            raise ValueError("{!r} is not in IndexedView".format(key))
+    
+    def key(self, index):
+        if isinstance(self.container, collections.Sequence):
+            return index
+        keys = self._ensure()
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("IndexedView index out of range")
+        return keys[self._counts.find(index)]
+    
+    def insert(self, key, value):
+        container = self.container
+        if not isinstance(container, collections.Mapping):
+            self.invalidate()
+            return insert(container, key, value)
+        
+        keys = self._ensure()
+        exists = key in container
+        result = insert(container, key, value)
+        if not exists:
+            if is_ordered(container) or not self._count or self.key(self._count - 1) < key:
+                self._positions[key] = len(keys)
+                keys.append(key)
+                self._counts.append(1)
+                self._count += 1
+            else:
+                self.invalidate()
+        return result
+    
+    def remove(self, key):
+        container = self.container
+        if not isinstance(container, collections.Mapping) or key not in container:
+            self.invalidate()
+            return remove(container, key)
+        
+        keys = self._ensure()
+        result = remove(container, key)
+        slot = self._positions.pop(key)
+        keys[slot] = _Removed
+        self._counts.add(slot, -1)
+        self._count -= 1
+        if len(keys) > 2 * self._count + 64:
+            self.invalidate()
+        return result
+    
+    def __getitem__(self, key):
+        return self.container[key]
+    
+    def __contains__(self, key):
+        return key in self.container
+    
+    def __iter__(self):
+        return self.keys()
+    
+    def __len__(self):
+        return len(self.container)
+
+indexedview = IndexedView
+
+
+class BlockedList(collections.MutableSequence):
+    """
+    List stored as chunks of roughly load items, with a Fenwick tree over chunk lengths for positional lookup.
+    Positional get, set, insert and delete cost O(log n) plus a move within one chunk.
+    """
+    
+    def __init__(self, items=(), load=None):
+        super().__init__()
+        
+        self._load = defaults.DEFAULT_CONTAINERS_BLOCK_SIZE if load is None else load
+        self._reset(items)
+    
+    def _reset(self, items):
+        items = list(items)
+        load = self._load
+        self._chunks = [items[i:i + load] for i in range(0, len(items), load)]
+        self._len = len(items)
+        self._tree = None
+    
+    def _build(self):
+        tree = [0] + [len(chunk) for chunk in self._chunks]
+        for i in range(1, len(tree)):
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+        return tree
+    
+    def _update(self, chunk, delta):
+        tree = self._tree
+        if tree is None:
+            return
+        i = chunk + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+    
+    def _normalize(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("BlockedList index out of range")
+        return index
+    
+    def _locate(self, index):
+        chunks = self._chunks
+        if index < len(chunks[0]):
+            return 0, index
+        last = len(chunks) - 1
+        offset = index - (self._len - len(chunks[last]))
+        if offset >= 0:
+            return last, offset
+        
+        tree = self._tree if self._tree is not None else self._build()
+        position = 0
+        step = 1 << (len(tree).bit_length() - 1)
+        while step:
+            following = position + step
+            if following < len(tree) and tree[following] <= index:
+                position = following
+                index -= tree[following]
+            step >>= 1
+        return position, index
+    
+    def _split(self, chunk):
+        values = self._chunks[chunk]
+        if len(values) > 2 * self._load:
+            half = len(values) // 2
+            self._chunks[chunk:chunk + 1] = [values[:half], values[half:]]
+            self._tree = None
+    
+    def _merge(self, chunk):
+        chunks = self._chunks
+        if not chunks[chunk]:
+            del chunks[chunk]
+            self._tree = None
+        elif len(chunks[chunk]) < self._load // 4 and chunk + 1 < len(chunks):
+            chunks[chunk].extend(chunks.pop(chunk + 1))
+            self._split(chunk)
+            self._tree = None
+    
+    def __len__(self):
+        return self._len
+    
+    def __iter__(self):
+        return it.chain.from_iterable(self._chunks)
+    
+    def __reversed__(self):
+        for chunk in reversed(self._chunks):
+            yield from reversed(chunk)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1 or start >= stop:
+                return type(self)(list(self)[index], self._load)
+            chunk, offset = self._locate(start)
+            values = it.chain([self._chunks[chunk][offset:]], it.islice(self._chunks, chunk + 1, None))
+            return type(self)(it.islice(it.chain.from_iterable(values), stop - start), self._load)
+        chunk, offset = self._locate(self._normalize(index))
+        return self._chunks[chunk][offset]
+    
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = list(self)
+            values[index] = value
+            self._reset(values)
+            return
+        chunk, offset = self._locate(self._normalize(index))
+        self._chunks[chunk][offset] = value
+    
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            values = list(self)
+            del values[index]
+            self._reset(values)
+            return
+        chunk, offset = self._locate(self._normalize(index))
+        del self._chunks[chunk][offset]
+        self._len -= 1
+        self._update(chunk, -1)
+        self._merge(chunk)
+    
+    def insert(self, index, value):
+        if index < 0:
+            index = max(index + self._len, 0)
+        if not self._chunks:
+            self._chunks.append([value])
+            self._len = 1
+            self._tree = None
+            return
+        if index >= self._len:
+            chunk = len(self._chunks) - 1
+            self._chunks[chunk].append(value)
+        else:
+            chunk, offset = self._locate(index)
+            self._chunks[chunk].insert(offset, value)
+        self._len += 1
+        self._update(chunk, 1)
+        self._split(chunk)
+    
+    def append(self, value):
+        self.insert(self._len, value)
+    
+    def extend(self, values):
+        values = list(values)
+        if not values:
+            return
+        if self._chunks and len(self._chunks[-1]) < self._load:
+            space = self._load - len(self._chunks[-1])
+            self._chunks[-1].extend(values[:space])
+            values = values[space:]
+        load = self._load
+        self._chunks.extend(values[i:i + load] for i in range(0, len(values), load))
+        self._len = sum(map(len, self._chunks))
+        self._tree = None
+    
+    def clear(self):
+        self._reset(())
+    
+    def index(self, value, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(self._len)
+        for position, item in enumerate(it.islice(self, start, stop), start):
+            if item == value:
+                return position
+        raise ValueError("{!r} is not in BlockedList".format(value))
+    
+    def __eq__(self, other):
+        return isinstance(other, collections.Sequence) and len(self) == len(other) and all(x == y for x, y in zip(self, other))
+    
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, list(self))
+
+blockedlist = BlockedList
@@ -1,6 +1,12 @@
+import bisect
+import collections
+import threading
+import time
+import weakref
+
 import functools as ft
 
-from . import accessors, coercions, indexers
+from . import accessors, coercions, indexers, mappings
 
 
 def itemproperty(key):
@@ -29,21 +35,135 @@ def attrcached(attr):
     def decorator(func):
         @ft.wraps(func)
         def decorated(obj, *args, **kwargs):
-            if not hasattr(obj, attr):
-                setattr(obj, attr, func(obj, *args, **kwargs))
-            return getattr(obj, attr)
+            try:
+                return getattr(obj, attr)
+            except AttributeError:
+                result = func(obj, *args, **kwargs)
+                setattr(obj, attr, result)
+                return result
         return decorated
     return decorator
 
 
+class CachedProperty(object):
+    def __init__(self, fget=None, name=None, slot=None):
+        super().__init__()
+        
+        self._name = name
+        self._slot = slot
+        
+        self.fget = fget
+        self.__doc__ = getattr(fget, "__doc__", None)
+    
+    def __set_name__(self, cls, name):
+        if self._name is None:
+            self._name = name
+    
+    @property
+    def name(self):
+        return self._name or self.fget.__name__
+    
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        
+        if self._slot is not None:
+            try:
+                return getattr(obj, self._slot)
+            except AttributeError:
+                result = self.fget(obj)
+                setattr(obj, self._slot, result)
+                return result
+        
+        # Non-data descriptor: once stored in the instance dict, lookups no longer reach __get__.
+        result = obj.__dict__[self.name] = self.fget(obj)
+        return result
+    
+    def invalidate(self, obj):
+        if self._slot is not None:
+            try:
+                delattr(obj, self._slot)
+            except AttributeError:
+                pass
+        else:
+            obj.__dict__.pop(self.name, None)
+
+
+def cachedproperty(fget=None, name=None, slot=None):
+    if fget is None:
+        return ft.partial(CachedProperty, name=name, slot=slot)
+    return CachedProperty(fget, name, slot)
+
+
+class CachedMethod(object):
+    def __init__(self, func=None, name=None):
+        super().__init__()
+        
+        self._name = name
+        
+        self.func = func
+        self.__doc__ = getattr(func, "__doc__", None)
+    
+    def __set_name__(self, cls, name):
+        if self._name is None:
+            self._name = name
+    
+    @property
+    def name(self):
+        return self._name or self.func.__name__
+    
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        
+        func = self.func
+        cache = {}
+        
+        @ft.wraps(func)
+        def _cached(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            try:
+                return cache[key]
+            except KeyError:
+                result = cache[key] = func(obj, *args, **kwargs)
+                return result
+        
+        _cached.cache_clear = cache.clear
+        obj.__dict__[self.name] = _cached
+        return _cached
+    
+    def invalidate(self, obj):
+        obj.__dict__.pop(self.name, None)
+
+cachedmethod = CachedMethod
+
+
+def invalidate(obj, name):
+    getattr(type(obj), name).invalidate(obj)
+
+
 class Indexed(object):
-    def __init__(self, function):
+    def __init__(self, function, cache=None):
         self._function = function
+        self._cache = MemoCache() if cache is True else cache
     def __getitem__(self, key):
+        if self._cache is not None and _hashable(key):
+            return self._cache.get(key, lambda: self._function(*coercions.coerce_tuple(key)))
         args = coercions.coerce_tuple(key)
         return self._function(*args)
+    def cache_info(self):
+        if self._cache is None:
+            return CacheInfo(0, 0, 0, 0, 0)
+        return self._cache.info()
+    def cache_clear(self):
+        if self._cache is not None:
+            self._cache.clear()
 
-indexed = Indexed
+
+def indexed(function=None, cache=None):
+    if function is None:
+        return ft.partial(Indexed, cache=cache)
+    return Indexed(function, cache)
 
 
 class UniversalProperty(object):
@@ -77,16 +197,19 @@ def universalmethod(func):
 class IndexedProperty(object):
     _indexer_type = indexers.Indexer
 
-    def __init__(self, fget=None, fset=None, fdel=None, fitr=None, flen=None, name=None):
+    def __init__(self, fget=None, fset=None, fdel=None, fitr=None, flen=None, name=None, fbget=None, fbset=None):
         super().__init__()
         
         self._name = name
+        self._attr_name = None
 
         self.fget = fget
         self.fset = fset
         self.fdel = fdel
         self.fitr = fitr
         self.flen = flen
+        self.fbget = fbget
+        self.fbset = fbset
 
     @property
     def name(self):
@@ -96,62 +219,385 @@ class IndexedProperty(object):
     def attr(self):
         return '__cached_%s_indexer' % (self.name,)
 
-    def __get__(self, obj, cls=None):
-        @attrcached(self.attr)
-        def _get(obj):
-            return self._indexer_type(obj, cls, self.name, self.fget, self.fset, self.fdel, self.fitr, self.flen)
+    def __set_name__(self, cls, name):
+        self._attr_name = name
+
+    def _indexer(self, obj, cls=None):
+        return self._indexer_type(obj, cls, self.name, self.fget, self.fset, self.fdel, self.fitr, self.flen, self.fbget, self.fbset)
 
+    def __get__(self, obj, cls=None):
         if obj is not None:
-            return _get(obj)
+            try:
+                cache = obj.__dict__
+            except AttributeError:
+                return attrcached(self.attr)(self._indexer)(obj, cls)
+            # Non-data descriptor: the cached indexer shadows it, so later lookups are plain dict hits.
+            result = cache[self._attr_name or self.name] = self._indexer(obj, cls)
+            return result
         elif cls is not None:
             return self
         else:
             raise ValueError("%s: Cannot get without 'obj' or 'cls'."  % (self,))
 
     def getter(self, fget):
-        return type(self)(fget, self.fset, self.fdel, self.fitr, self.flen)
+        return type(self)(fget, self.fset, self.fdel, self.fitr, self.flen, fbget=self.fbget, fbset=self.fbset)
 
     def setter(self, fset):
-        return type(self)(self.fget, fset, self.fdel, self.fitr, self.flen)
+        return type(self)(self.fget, fset, self.fdel, self.fitr, self.flen, fbget=self.fbget, fbset=self.fbset)
 
     def deleter(self, fdel):
-        return type(self)(self.fget, self.fset, fdel, self.fitr, self.flen)
+        return type(self)(self.fget, self.fset, fdel, self.fitr, self.flen, fbget=self.fbget, fbset=self.fbset)
 
     def iterator(self, fitr):
-        return type(self)(self.fget, self.fset, self.fdel, fitr, self.flen)
+        return type(self)(self.fget, self.fset, self.fdel, fitr, self.flen, fbget=self.fbget, fbset=self.fbset)
 
     def length(self, flen):
-        return type(self)(self.fget, self.fset, self.fdel, self.fitr, flen)
+        return type(self)(self.fget, self.fset, self.fdel, self.fitr, flen, fbget=self.fbget, fbset=self.fbset)
+
+    def batch_getter(self, fbget):
+        return type(self)(self.fget, self.fset, self.fdel, self.fitr, self.flen, fbget=fbget, fbset=self.fbset)
+
+    def batch_setter(self, fbset):
+        return type(self)(self.fget, self.fset, self.fdel, self.fitr, self.flen, fbget=self.fbget, fbset=fbset)
 
 
 indexedproperty = IndexedProperty
 
 
-def flyweight(cls):
-    _old_cls_new = cls.__new__
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class FlyweightCache(object):
+    def __init__(self, weak=False, maxsize=None):
+        super().__init__()
+        
+        if weak and maxsize is not None:
+            raise ValueError("Flyweight cache cannot be both weak and bounded.")
+        
+        if weak:
+            self.instances = weakref.WeakValueDictionary()
+        elif maxsize is not None:
+            self.instances = mappings.LRUMap(maxsize=maxsize)
+        else:
+            self.instances = dict()
+        
+        self.maxsize = maxsize
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.cleared = 0
+        self.keys = {}
+    
+    def _remember(self, instance, key):
+        ident = id(instance)
+        try:
+            ref = weakref.ref(instance, lambda _, keys=self.keys: keys.pop(ident, None))
+        except TypeError:
+            ref = None
+        self.keys[ident] = (ref, key)
+    
+    def key(self, instance):
+        try:
+            ref, key = self.keys[id(instance)]
+        except KeyError:
+            return None
+        if ref is None:
+            # Without a weak reference, only trust the entry while the instance is still the cached one.
+            return key if self.instances.get(key) is instance else None
+        return key if ref() is instance else None
+    
+    def get(self, key, factory):
+        try:
+            result = self.instances[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return result
+        
+        with self.lock:
+            try:
+                result = self.instances[key]
+            except KeyError:
+                result = factory()
+                self.instances[key] = result
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+    
+    def info(self):
+        currsize = len(self.instances)
+        return CacheInfo(self.hits, self.misses, self.misses - self.cleared - currsize, self.maxsize, currsize)
+    
+    def clear(self):
+        with self.lock:
+            self.cleared += len(self.instances)
+            self.instances.clear()
+            for ident in [ident for ident, (ref, key) in self.keys.items() if ref is None]:
+                del self.keys[ident]
 
+
+def flyweight(cls=None, weak=False, maxsize=None):
+    if cls is None:
+        return ft.partial(flyweight, weak=weak, maxsize=maxsize)
+    
+    _old_cls_new = cls.__new__
+    
     @classmethod
     def _new_cls_new(cls, *args, **kargs):
+        key = (args, tuple(sorted(kargs.items())))
         def _new_cls_new_():
             if _old_cls_new is object.__new__:
                 result = _old_cls_new(cls)
             else:
                 result = _old_cls_new(*args, **kargs)
+            cls._flyweight._remember(result, key)
             return result
-        return accessors.lazy_setdefaultitem(cls._instances, (args, tuple(kargs.items())), _new_cls_new_)
+        return cls._flyweight.get(key, _new_cls_new_)
     
-    cls._instances = dict()
+    def _flyweight_reduce(self):
+        key = type(self)._flyweight.key(self)
+        if key is None:
+            return object.__reduce__(self)
+        return (_new_flyweight, (type(self), key))
+    
+    cls._flyweight = FlyweightCache(weak=weak, maxsize=maxsize)
+    cls._instances = cls._flyweight.instances
     cls.__new__ = _new_cls_new
+    if cls.__reduce__ is object.__reduce__ and cls.__reduce_ex__ is object.__reduce_ex__:
+        cls.__reduce__ = _flyweight_reduce
+        if not hasattr(cls, "__copy__") and not hasattr(cls, "__deepcopy__"):
+            cls.__copy__ = _copy_flyweight
+            cls.__deepcopy__ = _copy_flyweight
     return cls
 
 
+def _copy_flyweight(obj, memo=None):
+    # Instances are interned and shared, so a copy is the cached instance itself.
+    return obj
+
+
+def _new_flyweight(cls, key):
+    args, kargs = key
+    # The installed __new__ is a classmethod called with the class again as its first argument.
+    return cls(*args[1:], **dict(kargs))
+
+
+def flyweight_info(cls):
+    return cls._flyweight.info()
+
+
+def flyweight_clear(cls):
+    cls._flyweight.clear()
+
+
+def _hashable(key):
+    try:
+        hash(key)
+    except TypeError:
+        return False
+    return True
+
+
+class MemoCache(object):
+    def __init__(self, maxsize=None, ttl=None):
+        super().__init__()
+        
+        if maxsize is not None:
+            self.items = mappings.LRUMap(maxsize=maxsize)
+        else:
+            self.items = dict()
+        
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._purge_size = 64
+    
+    def _purge(self):
+        now = time.monotonic()
+        for key, (value, expires) in list(self.items.items()):
+            if expires <= now:
+                del self.items[key]
+                self.expired += 1
+        self._purge_size = max(2 * len(self.items), 64)
+    
+    def _lookup(self, key):
+        value, expires = self.items[key]
+        if expires is not None and expires <= time.monotonic():
+            raise KeyError(key)
+        self.hits += 1
+        return value
+    
+    def get(self, key, factory):
+        try:
+            return self._lookup(key)
+        except KeyError:
+            pass
+        
+        with self.lock:
+            try:
+                return self._lookup(key)
+            except KeyError:
+                if key in self.items:
+                    self.expired += 1
+            result = factory()
+            self.items[key] = (result, None if self.ttl is None else time.monotonic() + self.ttl)
+            self.misses += 1
+            # Expired entries are otherwise only replaced on access, so sweep them as the cache doubles.
+            if self.ttl is not None and len(self.items) >= self._purge_size:
+                self._purge()
+        return result
+    
+    def info(self):
+        evictions = getattr(self.items, "evictions", 0) + self.expired
+        return CacheInfo(self.hits, self.misses, evictions, self.maxsize, len(self.items))
+    
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+def memoize(func=None, maxsize=None, ttl=None):
+    if func is None:
+        return ft.partial(memoize, maxsize=maxsize, ttl=ttl)
+    
+    cache = MemoCache(maxsize=maxsize, ttl=ttl)
+    
+    @ft.wraps(func)
+    def _memoized(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        if _hashable(key):
+            return cache.get(key, lambda: func(*args, **kwargs))
+        return func(*args, **kwargs)
+    
+    _memoized.cache = cache
+    _memoized.cache_info = cache.info
+    _memoized.cache_clear = cache.clear
+    return _memoized
+
+
 def log(logger, level):
     def _decorator(func):
         @ft.wraps(func)
         def _decorated(*args,**kwargs):
+            if not logger.isEnabledFor(level):
+                return func(*args,**kwargs)
             logger.log(level, "%s(%r,%r)", func.__name__ , args, kwargs)
             result = func(*args,**kwargs)
             logger.log(level, "%s(%r,%r) -> %r", func.__name__ , args, kwargs, result)
             return result
         return _decorated
     return _decorator
+
+
+class Metrics(object):
+    """
+    Call count, error count and a fixed-size latency histogram with power-of-two buckets from 1us.
+    """
+    
+    _bounds = tuple(1e-6 * (1 << i) for i in range(32))
+    
+    def __init__(self, name):
+        super().__init__()
+        
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.errors = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+            self.buckets = [0] * (len(self._bounds) + 1)
+    
+    def record(self, elapsed, error=False):
+        index = bisect.bisect_left(self._bounds, elapsed)
+        with self._lock:
+            self.count += 1
+            self.errors += error
+            self.total += elapsed
+            self.buckets[index] += 1
+            if self.min is None or elapsed < self.min:
+                self.min = elapsed
+            if self.max is None or elapsed > self.max:
+                self.max = elapsed
+    
+    def percentile(self, q):
+        rank = q * self.count
+        total = 0
+        for index, count in enumerate(self.buckets):
+            total += count
+            if count and total >= rank:
+                return min(self._bounds[index], self.max) if index < len(self._bounds) else self.max
+        return None
+    
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "total": self.total,
+                "mean": self.total / self.count if self.count else None,
+                "min": self.min,
+                "max": self.max,
+                "p50": self.percentile(0.5),
+                "p90": self.percentile(0.9),
+                "p99": self.percentile(0.99),
+            }
+
+
+class MetricsRegistry(object):
+    def __init__(self, enabled=True):
+        super().__init__()
+        
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name):
+        try:
+            return self._metrics[name]
+        except KeyError:
+            with self._lock:
+                return self._metrics.setdefault(name, Metrics(name))
+    
+    def snapshot(self):
+        return {name: metrics.snapshot() for name, metrics in list(self._metrics.items())}
+    
+    def reset(self):
+        for metrics in list(self._metrics.values()):
+            metrics.reset()
+
+
+metrics = MetricsRegistry()
+
+
+def instrument(func=None, name=None, registry=None):
+    if func is None:
+        return ft.partial(instrument, name=name, registry=registry)
+    
+    registry = metrics if registry is None else registry
+    _metrics = registry.get("{}.{}".format(func.__module__, func.__qualname__) if name is None else name)
+    clock = time.perf_counter
+    
+    @ft.wraps(func)
+    def _decorated(*args, **kwargs):
+        if not registry.enabled:
+            return func(*args, **kwargs)
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            _metrics.record(clock() - start, True)
+            raise
+        _metrics.record(clock() - start)
+        return result
+    _decorated.metrics = _metrics
+    return _decorated
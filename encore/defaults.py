@@ -2,6 +2,14 @@
 DEFAULT_OBJECTS_TYPE_KEY = "__type__"
 DEFAULT_OBJECTS_ATTRS_KEY = "__attrs__"
 DEFAULT_OBJECTS_ITEMS_KEY = "__items__"
+DEFAULT_OBJECTS_ID_KEY = "__id__"
+DEFAULT_OBJECTS_REF_KEY = "__ref__"
+
+DEFAULT_OBJECTS_BUFFER_SIZE = 1 << 16
+DEFAULT_OBJECTS_TYPE_CACHE_SIZE = None
+DEFAULT_OBJECTS_MAPPED_CACHE_SIZE = 128
 
 DEFAULT_OBJECTS_PARENT_ATTR = "_parent"
 DEFAULT_OBJECTS_PARENT_ATTR_ENABLED = True
+
+DEFAULT_CONTAINERS_BLOCK_SIZE = 1000
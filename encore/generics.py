@@ -1,4 +1,9 @@
+import array
+import collections
+import copyreg
 import sys
+import threading
+import weakref
 
 import functools as ft
 
@@ -24,22 +29,83 @@ def mangle(cls, parameters):
     return "_".join([cls.__name__, uid])
 
 
+_factories = weakref.WeakKeyDictionary()
+
+
+def _factory(cls, weak=False):
+    try:
+        return _factories[cls]
+    except KeyError:
+        return GenericClassFactory(cls, weak)
+
+
+def _new_generic(factory, parameters, *args):
+    cls = factory[parameters]
+    return cls.__new__(cls, *args)
+
+
+def _call_generic(factory, parameters, *args):
+    return factory[parameters](*args)
+
+
+def _reduce_generic(obj, protocol):
+    cls = type(obj)
+    reduced = object.__reduce_ex__(obj, max(protocol, 2))
+    if not isinstance(reduced, tuple) or cls.__dict__.get("_factory") is None:
+        return reduced
+    func, args = reduced[:2]
+    if func is copyreg.__newobj__ and args[0] is cls:
+        return (_new_generic, (cls._factory, cls._parameters) + args[1:]) + reduced[2:]
+    if func is cls:
+        return (_call_generic, (cls._factory, cls._parameters) + args) + reduced[2:]
+    return reduced
+
+
 class GenericClassFactory(object):
-    def __init__(self, cls):
+    def __init__(self, cls, weak=False):
         super().__init__()
         
         self._cls = cls
-        self._instantiations = {}
+        self._weak = weak
+        self._instantiations = weakref.WeakValueDictionary() if weak else {}
+        self._lock = threading.RLock()
+        
+        self.__module__ = cls.__module__
+        self.__qualname__ = cls.__qualname__
+        _factories.setdefault(cls, self)
+    
+    def __reduce__(self):
+        module = sys.modules.get(self.__module__)
+        if getattr(module, self.__qualname__, None) is self:
+            return self.__qualname__
+        return (_factory, (self._cls, self._weak))
     
     def __getitem__(self, key):
-        parameters = coercions.coerce_tuple(key)
-        name = mangle(self._cls, parameters)
         try:
-            new_cls = self._instantiations[name]
-        except KeyError:
-            new_cls = self._instantiations[name] = type(name, (self._cls,), {"_parameters": parameters})
+            return self._instantiations[key]
+        except (KeyError, TypeError):
+            pass
+        
+        parameters = coercions.coerce_tuple(key)
+        with self._lock:
+            try:
+                new_cls = self._instantiations[parameters]
+            except KeyError:
+                new_cls = self._instantiations[parameters] = self._instantiate(parameters)
+            if key is not parameters and not isinstance(key, collections.Iterator):
+                try:
+                    self._instantiations[key] = new_cls
+                except TypeError:
+                    pass
         return new_cls
     
+    def _instantiate(self, parameters):
+        namespace = {"_parameters": parameters, "_factory": self, "__reduce_ex__": _reduce_generic}
+        specialize = getattr(self._cls, "_specialize", None)
+        if specialize is not None:
+            namespace.update(specialize(parameters))
+        return type(mangle(self._cls, parameters), (self._cls,), namespace)
+    
     def __call__(self, *args, **kwargs):
         return self._cls(*args, **kwargs)
     
@@ -50,8 +116,10 @@ class GenericClassFactory(object):
         return str(self._cls)
 
 
-def generic(cls):
-    return GenericClassFactory(cls)
+def generic(cls=None, weak=False):
+    if cls is None:
+        return ft.partial(generic, weak=weak)
+    return GenericClassFactory(cls, weak)
 
 
 def latebind(func):
@@ -66,5 +134,80 @@ def latebind(func):
 def parameter(key, default=None):
     @decorators.universalproperty
     def _parameter(cls, obj):
-        return _unself(accessors.getitem(cls._parameters, key, default), cls)
+        return _unself(accessors.getitem(getattr(cls, "_parameters", ()), key, default), cls)
     return _parameter
+
+
+_TYPECODES = {int: "q", float: "d"}
+
+
+def typecode(obj):
+    if isinstance(obj, utilities.Bits):
+        for code in "BHIQ":
+            if array.array(code).itemsize * 8 >= obj.size:
+                return code
+        return None
+    try:
+        return _TYPECODES.get(obj)
+    except TypeError:
+        return None
+
+
+class ArraySequence(collections.MutableSequence):
+    """
+    Sequence stored in an array.array when specialized with int, float or a utilities.Bits layout, and in a list otherwise.
+    """
+    
+    _parameters = ()
+    _typecode = None
+    
+    item_type = parameter(0)
+    
+    @classmethod
+    def _specialize(cls, parameters):
+        return {"_typecode": typecode(parameters[0])} if parameters else {}
+    
+    @classmethod
+    def _wrap(cls, data):
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+    
+    def __init__(self, items=()):
+        super().__init__()
+        
+        self._data = list(items) if self._typecode is None else array.array(self._typecode, items)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._wrap(self._data[index])
+        return self._data[index]
+    
+    def __setitem__(self, index, value):
+        self._data[index] = value
+    
+    def __delitem__(self, index):
+        del self._data[index]
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __eq__(self, other):
+        return isinstance(other, collections.Sequence) and len(self) == len(other) and all(x == y for x, y in zip(self, other))
+    
+    def insert(self, index, value):
+        self._data.insert(index, value)
+    
+    def extend(self, values):
+        self._data.extend(values)
+    
+    def buffer(self):
+        return memoryview(self._data)
+    
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, list(self._data))
+
+arraysequence = generic(ArraySequence)
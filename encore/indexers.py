@@ -9,7 +9,7 @@ class Indexer(collections.MutableMapping):
     Provides uniform access to attrs, items, fields etc.
     """
 
-    def __init__(self, obj, cls, name, fget=None, fset=None, fdel=None, fitr=None, flen=None):
+    def __init__(self, obj, cls, name, fget=None, fset=None, fdel=None, fitr=None, flen=None, fbget=None, fbset=None):
         self.obj = obj
         self.cls = cls
         self.name = name
@@ -18,6 +18,8 @@ class Indexer(collections.MutableMapping):
         self.fdel = fdel
         self.fitr = fitr
         self.flen = flen
+        self.fbget = fbget
+        self.fbset = fbset
 
     def __getitem__(self, key):
         return self.fget(self.obj, key)
@@ -28,6 +30,19 @@ class Indexer(collections.MutableMapping):
     def __delitem__(self, key):
         self.fdel(self.obj, key)
 
+    def get_many(self, keys):
+        if self.fbget is not None:
+            return self.fbget(self.obj, keys)
+        fget, obj = self.fget, self.obj
+        return [fget(obj, key) for key in keys]
+
+    def set_many(self, items):
+        if self.fbset is not None:
+            return self.fbset(self.obj, items)
+        fset, obj = self.fset, self.obj
+        for key, value in (items.items() if isinstance(items, collections.Mapping) else items):
+            fset(obj, key, value)
+
     def __contains__(self, key):
         try:
             self[key]
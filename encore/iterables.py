@@ -1,8 +1,14 @@
+import array
 import collections
 
 import functools as ft
 import itertools as it
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 drop = lambda iterable, n: it.islice(iterable, n, None)
 take = lambda iterable, n: it.islice(iterable, None, n)
 
@@ -27,33 +33,64 @@ def split(iterable, n):
     return take(i1, n), drop(i2, n)
 
 
+def chunked(iterable, n):
+    iterator = iter(iterable)
+    return iter(lambda: list(take(iterator, n)), [])
+
+
 def distinct(iterable):
     return collections.OrderedDict.fromkeys(iterable).keys()
 
 
-def flattened_full(iterable):
-    if not isinstance(iterable, collections.Iterable) or isinstance(iterable, str):
+_LEAF_TYPES = (str, bytes, bytearray, memoryview, array.array)
+
+
+def is_leaf(obj):
+    return not isinstance(obj, collections.Iterable) or isinstance(obj, _LEAF_TYPES)
+
+
+def _leaf(leaf):
+    if leaf is None:
+        return is_leaf
+    return lambda obj: not isinstance(obj, collections.Iterable) or leaf(obj)
+
+
+def _flattened(iterable, depth, leaf):
+    if leaf(iterable) or depth is not None and depth < 0:
         yield iterable
-    else:
-        for items in iterable:
-            for item in flattened_full(items):
+        return
+    stack = [iter(iterable)]
+    while stack:
+        for item in stack[-1]:
+            if depth is not None and len(stack) > depth or leaf(item):
                 yield item
+            else:
+                stack.append(iter(item))
+                break
+        else:
+            stack.pop()
+
+
+def flattened_full(iterable, leaf=None):
+    return _flattened(iterable, None, _leaf(leaf))
 
 
-def flattened_deep(iterable, depth=1):
+def flattened_deep(iterable, depth=1, leaf=None):
+    if leaf is not None:
+        return _flattened(iterable, depth, _leaf(leaf))
     if depth < 0:
-        yield iterable
-    else:
-        for items in iterable:
-            for item in flattened_deep(items, depth-1):
-                yield item
+        return iter([iterable])
+    result = iter(iterable)
+    for _ in range(depth):
+        result = it.chain.from_iterable(result)
+    return result
 
 
-def flattened(iterable, depth=None):
+def flattened(iterable, depth=None, leaf=None):
     if depth is None:
-        return flattened_full(iterable)
+        return flattened_full(iterable, leaf)
     else:
-        return flattened_deep(iterable, depth)
+        return flattened_deep(iterable, depth, leaf)
 
 
 def cycled(iterable, n):
@@ -68,10 +105,65 @@ def repeated(iterable, n):
             yield item
 
 
-def windowed(iterable, n=1):
-    head, tail = split(iterable, n)
-    window = collections.deque(head, maxlen=n)
+class SliceView(collections.Sequence):
+    def __init__(self, sequence, start=0, stop=None):
+        super().__init__()
+        
+        self._sequence = sequence
+        self._start = start
+        self._stop = len(sequence) if stop is None else stop
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return SliceView(self._sequence, self._start + start, self._start + max(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SliceView index out of range")
+        return self._sequence[self._start + index]
+    
+    def __len__(self):
+        return self._stop - self._start
+    
+    def __iter__(self):
+        return map(self._sequence.__getitem__, range(self._start, self._stop))
+    
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, list(self))
+
+
+def windowed_view(sequence, n=1, step=1):
+    if numpy is not None and isinstance(sequence, numpy.ndarray):
+        if len(sequence) < n:
+            return iter([sequence])
+        return numpy.lib.stride_tricks.sliding_window_view(sequence, n, axis=0)[::step]
+    try:
+        view = memoryview(sequence)
+    except TypeError:
+        return (SliceView(sequence, i, min(i + n, len(sequence))) for i in range(0, max(len(sequence) - n, 0) + 1, step))
+    if view.ndim != 1:
+        view = view.cast("B").cast(view.format)
+    return (view[i:i + n] for i in range(0, max(len(view) - n, 0) + 1, step))
+
+
+def windowed(iterable, n=1, step=1, view=False):
+    if view:
+        return windowed_view(iterable, n, step)
+    return _windowed(iterable, n, step)
+
+
+def _windowed(iterable, n, step):
+    iterator = iter(iterable)
+    window = collections.deque(take(iterator, n), maxlen=n)
     yield window
-    for e in tail:
-        window.append(e)
+    while True:
+        count = 0
+        for e in take(iterator, step):
+            window.append(e)
+            count += 1
+        if count < step:
+            return
         yield window
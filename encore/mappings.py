@@ -1,5 +1,6 @@
 import collections
 import copy
+import threading
 
 from .accessors import getitem, setitem, delitem
 from .utilities import identity, constant
@@ -93,3 +94,47 @@ class LowerCaseMap(CustomMap):
 class UpperCaseMap(CustomMap):
     def __init__(self, items=None, factory=None):
         super(UpperCaseMap, self).__init__(items, factory=factory, key=lambda k: k.upper())
+
+
+class LRUMap(collections.MutableMapping):
+    def __init__(self, items=None, maxsize=None, *args, **kwargs):
+        super(LRUMap, self).__init__(*args, **kwargs)
+        
+        self._data = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.maxsize = maxsize
+        self.evictions = 0
+        
+        if items is not None:
+            self.update(items)
+    
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+    
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+    
+    def __contains__(self, key):
+        return key in self._data
+    
+    def __iter__(self):
+        return iter(list(self._data))
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __repr__(self):
+        return repr(self._data)
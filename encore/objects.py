@@ -1,20 +1,24 @@
+import builtins
+import copyreg
+import importlib
+import io
+import os
+import pickle
+import re
 import sys
+import threading
+import types
+import weakref
 
 import collections
 import contextlib as cl
+import functools as ft
 
 import json
+import json.decoder
+import mmap
 
-from . import accessors, defaults, functions, managers, utilities
-
-
-@cl.contextmanager
-def direct_access(obj):
-    direct_getattr = managers.attrset(type(obj), "__getattr__", functions.raiser(lambda self, key: AttributeError(key)))
-    direct_setattr = managers.attrset(type(obj), "__setattr__", object.__setattr__)
-    direct_delattr = managers.attrset(type(obj), "__delattr__", object.__delattr__)
-    with direct_getattr, direct_setattr, direct_delattr:
-        yield
+from . import accessors, coercions, containers, defaults, iterables, mappings, utilities
 
 
 def dereference(obj, context):
@@ -24,22 +28,107 @@ def dereference(obj, context):
     return obj
 
 
+def _qualify(cls):
+    if cls.__module__ in ("__main__", "builtins"):
+        return cls.__qualname__
+    return "{}.{}".format(cls.__module__, cls.__qualname__)
+
+
+def _resolve(name):
+    parts = name.split('.')
+    for i in range(len(parts) - 1, 0, -1):
+        try:
+            m = importlib.import_module(".".join(parts[:i]))
+        except ImportError:
+            continue
+        return ft.reduce(accessors.getattr, parts[i:], m)
+    m = sys.modules['__main__']
+    if not hasattr(m, parts[0]) and hasattr(builtins, parts[0]):
+        m = builtins
+    return ft.reduce(accessors.getattr, parts, m)
+
+
+class TypeRegistry(object):
+    def __init__(self, maxsize=None):
+        super().__init__()
+        
+        self._lock = threading.Lock()
+        self._types = {}
+        self._names = {}
+        # Unbounded caches also hold the registered entries, so a hit is a single dict lookup.
+        self._merged = maxsize is None
+        self._resolved = {} if self._merged else mappings.LRUMap(maxsize=maxsize)
+        self._qualified = {} if self._merged else mappings.LRUMap(maxsize=maxsize)
+    
+    def _cache(self, cache, key, value):
+        if self._merged:
+            cache[key] = value
+        else:
+            cache.pop(key, None)
+    
+    def register(self, cls=None, name=None, aliases=()):
+        if cls is None:
+            return lambda cls: self.register(cls, name, aliases)
+        
+        name = _qualify(cls) if name is None else name
+        with self._lock:
+            self._names[cls] = name
+            self._cache(self._qualified, cls, name)
+            for key in (name,) + tuple(aliases):
+                self._types[key] = cls
+                self._cache(self._resolved, key, cls)
+        return cls
+    
+    def unregister(self, cls):
+        with self._lock:
+            self._names.pop(cls, None)
+            self._qualified.pop(cls, None)
+            for key in [key for key, value in self._types.items() if value is cls]:
+                del self._types[key]
+                self._resolved.pop(key, None)
+    
+    def type_to_str(self, obj):
+        if isinstance(obj, type):
+            result = self._qualified.get(obj)
+            if result is None:
+                result = self._names.get(obj)
+                if result is None:
+                    result = self._qualified[obj] = _qualify(obj)
+            return result
+        return obj
+    
+    def str_to_type(self, obj):
+        if isinstance(obj, str):
+            result = self._resolved.get(obj)
+            if result is None:
+                result = self._types.get(obj)
+                if result is None:
+                    result = self._resolved[obj] = _resolve(obj)
+            return result
+        return obj
+    
+    def clear(self):
+        with self._lock:
+            self._resolved.clear()
+            self._qualified.clear()
+            if self._merged:
+                self._resolved.update(self._types)
+                self._qualified.update(self._names)
+
+
+registry = TypeRegistry(maxsize=defaults.DEFAULT_OBJECTS_TYPE_CACHE_SIZE)
+
+
+def register_type(cls=None, name=None, aliases=()):
+    return registry.register(cls, name, aliases)
+
+
 def type_to_str(obj):
-    if isinstance(obj, type):
-        return obj.__qualname__
-    return obj
+    return registry.type_to_str(obj)
     
 
 def str_to_type(obj):
-    if isinstance(obj, str):
-        parts = obj.rsplit('.', 1)
-        if len(parts) > 1:
-            m = __import__(parts[0], globals(), locals(), parts[1])
-        else:
-            m =  sys.modules['__main__']
-        c = accessors.getattr(m, parts[-1])
-        return c
-    return obj
+    return registry.str_to_type(obj)
 
 
 def is_primitive(data):
@@ -58,6 +147,13 @@ def is_object(data):
     return isinstance(data, Object)
 
 
+def _wrap(data):
+    # Object(data=None) builds empty attrs/items, so None is wrapped directly.
+    if data is None:
+        return _new_object(Object, None)
+    return Object(data=data)
+
+
 def encode_builtin(data, codec):
     def _encode_builtin(data, codec):
         if is_primitive(data):
@@ -71,7 +167,7 @@ def encode_builtin(data, codec):
         
         raise ValueError(type(data).__name__)
     
-    return Object(data=(_encode_builtin(data, codec)))
+    return _wrap(_encode_builtin(data, codec))
 
 
 def decode_builtin(data, codec):
@@ -90,6 +186,115 @@ def decode_builtin(data, codec):
     return _decode_builtin(dataof(data), codec)
 
 
+_shared = threading.local()
+
+
+class SharedEncoding(object):
+    def __init__(self):
+        super().__init__()
+        
+        self._ids = {}
+        self._values = []
+    
+    def reference(self, data):
+        try:
+            return Object(data={Object._ref_key: self._ids[id(data)]})
+        except KeyError:
+            return None
+    
+    def add(self, data, result):
+        uid = self._ids[id(data)] = len(self._values)
+        self._values.append(data)
+        accessors.setitem(dataof(result), Object._id_key, uid)
+
+
+class SharedDecoding(object):
+    def __init__(self, data):
+        super().__init__()
+        
+        self._nodes = {}
+        self._values = {}
+        
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            node = dataof(item)
+            if is_mapping(node):
+                uid = node.get(Object._id_key)
+                if uid is not None:
+                    self._nodes[uid] = item
+                stack.extend(node.values())
+            elif is_sequence(node) and not is_primitive(node):
+                stack.extend(node)
+    
+    def resolve(self, data, codec):
+        node = dataof(data)
+        if not is_mapping(node):
+            return utilities.Undefined
+        if Object._ref_key in node:
+            uid = node[Object._ref_key]
+            try:
+                return self._values[uid]
+            except KeyError:
+                return codec._decode(self._nodes[uid])
+        return self._values.get(node.get(Object._id_key), utilities.Undefined)
+    
+    def add(self, data, result):
+        uid = accessors.getitem(dataof(data), Object._id_key, None)
+        if uid is not None:
+            self._values[uid] = result
+
+
+@cl.contextmanager
+def shared_encoding(enabled=True):
+    previous = getattr(_shared, "encoding", None)
+    _shared.encoding = SharedEncoding() if enabled else None
+    try:
+        yield _shared.encoding
+    finally:
+        _shared.encoding = previous
+
+
+@cl.contextmanager
+def shared_decoding(data, enabled=True):
+    previous = getattr(_shared, "decoding", None)
+    _shared.decoding = SharedDecoding(data) if enabled else None
+    try:
+        yield _shared.decoding
+    finally:
+        _shared.decoding = previous
+
+
+def _encode_state(data, getstate, type_str_, codec, view=None):
+    session = getattr(_shared, "encoding", None)
+    if session is not None:
+        result = session.reference(data)
+        if result is not None:
+            return result
+    
+    result = Object(type=type_str_, attrs={}, items={})
+    if session is not None:
+        session.add(data, result)
+    getstate(data, (View if view is None else view)(result, codec))
+    return result
+
+
+def _decode_state(data, type_, setstate, codec):
+    session = getattr(_shared, "decoding", None)
+    result = type_()
+    if session is not None:
+        session.add(data, result)
+    setstate(result, View(data, codec))
+    return result
+
+
+def _decode_shared(data, codec):
+    session = getattr(_shared, "decoding", None)
+    if session is not None:
+        return session.resolve(data, codec)
+    return utilities.Undefined
+
+
 def _encode(data, codec):
     #print("encode", data, codec)
     type_ = type(data)
@@ -97,9 +302,7 @@ def _encode(data, codec):
     type_str_ = type_to_str(type_str_)
     getstate = accessors.getattr(type_, "__getstate__", None)
     if getstate is not None:
-        result = Object(type=type_str_, attrs={}, items={})
-        getstate(data, View(result, codec))
-        return result
+        return _encode_state(data, getstate, type_str_, codec)
     else:
         return encode_builtin(data, codec)
         
@@ -108,13 +311,14 @@ def _encode(data, codec):
 
 def _decode(data, codec):
     #print("decode", data, codec)
+    result = _decode_shared(data, codec)
+    if utilities.defined(result):
+        return result
     type_str_ = typeof(data, codec.type)
     type_ = str_to_type(type_str_)
     setstate = accessors.getattr(type_, "__setstate__", None)
     if setstate is not None:
-        result = type_()
-        setstate(result, View(data, codec))
-        return result
+        return _decode_state(data, type_, setstate, codec)
     else:
         return decode_builtin(data, codec)
     
@@ -161,6 +365,9 @@ class Codec(CodecBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
+        self._encoder = self.encode
+        self._decoder = self.decode
+        
         def encode(func):
             return lambda data: _encode(func(data), self)
         
@@ -169,15 +376,185 @@ class Codec(CodecBase):
         
         self.encode = encode(self.encode)
         self.decode = decode(self.decode)
+    
+    def _encode(self, data):
+        return _encode(data, self)
+    
+    def _decode(self, data):
+        return _decode(data, self)
+    
+    def __reduce__(self):
+        # Attrs and items are restored as state, so recursive codecs pickle by reference.
+        args = (self.type, None, None, self._encoder, self._decoder)
+        return (type(self), args, {"attrs": self.attrs, "items": self.items})
+    
+    def compile(self):
+        return compile_codec(self)
+
+
+def _compile_children(children, compiled):
+    if isinstance(children, collections.Mapping):
+        default = _compile_codec(children.get(CodecBase._default_key), compiled)
+        lookup = {key: _compile_codec(value, compiled) for key, value in children.items()}
+        return lookup, default
+    
+    return {}, _compile_codec(children, compiled)
+
+
+def _compile_codec(codec, compiled):
+    if isinstance(codec, CompiledCodec):
+        return codec
+    
+    key = None if codec is None else id(codec)
+    try:
+        return compiled[key][0]
+    except KeyError:
+        pass
+    
+    codec = Codec() if codec is None else codec
+    result = CompiledCodec.__new__(CompiledCodec)
+    compiled[key] = (result, codec)
+    result._compile(codec, compiled)
+    return result
+
+
+def compile_codec(codec):
+    return _compile_codec(codec, {})
+
+
+def _compile_encoder(codec, type_):
+    type_str_ = None if type_ is codec.type else type_
+    type_str_ = type_to_str(type_str_)
+    getstate = accessors.getattr(type_, "__getstate__", None)
+    if getstate is not None:
+        def _encoder(data):
+            return _encode_state(data, getstate, type_str_, codec)
+        return _encoder
+    
+    if issubclass(type_, (type(None), bool, int, float, str)):
+        return _wrap
+    
+    if issubclass(type_, collections.Sequence):
+        def _encoder(data):
+            item = codec.item()
+            return Object(data=type_(item._encode(value) for value in data))
+        return _encoder
+    
+    if issubclass(type_, collections.Mapping):
+        def _encoder(data):
+            item = codec.item
+            return Object(data=type_((key, item(key)._encode(value)) for key, value in data.items()))
+        return _encoder
+    
+    def _encoder(data):
+        raise ValueError(type_.__name__)
+    return _encoder
+
+
+def _compile_decoder(codec, type_str_):
+    type_ = str_to_type(type_str_)
+    setstate = accessors.getattr(type_, "__setstate__", None)
+    if setstate is not None:
+        def _decoder(data):
+            return _decode_state(data, type_, setstate, codec)
+        return _decoder
+    
+    return codec._decode_builtin
+
+
+class CompiledCodec(object):
+    """
+    Codec tree with child lookups, type resolution and per-type dispatch resolved ahead of time.
+    """
+    
+    def __init__(self, codec):
+        super().__init__()
+        
+        self._compile(codec, {id(codec): (self, codec)})
+    
+    def _compile(self, codec, compiled):
+        self.codec = codec
+        
+        self.type = codec.type
+        self.attrs = codec.attrs
+        self.items = codec.items
         
+        self._encoder = codec._encoder
+        self._decoder = codec._decoder
         
+        self._encoders = {}
+        self._decoders = {}
+        
+        self._attr_lookup, self._attr_default = _compile_children(codec.attrs, compiled)
+        self._item_lookup, self._item_default = _compile_children(codec.items, compiled)
+        
+        if self._encoder is utilities.identity:
+            self.encode = self._encode
+        if self._decoder is utilities.identity:
+            self.decode = self._decode
+    
+    def attr(self, key=None):
+        return self._attr_lookup.get(key, self._attr_default)
+    
+    def item(self, key=None):
+        return self._item_lookup.get(key, self._item_default)
+    
+    def encode(self, data):
+        return self._encode(self._encoder(data))
+    
+    def decode(self, data):
+        return self._decoder(self._decode(data))
+    
+    def compile(self):
+        return self
+    
+    def __reduce__(self):
+        return (compile_codec, (self.codec,))
+    
+    def _encode(self, data):
+        type_ = type(data)
+        try:
+            encoder = self._encoders[type_]
+        except KeyError:
+            encoder = self._encoders[type_] = _compile_encoder(self, type_)
+        return encoder(data)
+    
+    def _decode(self, data):
+        result = _decode_shared(data, self)
+        if utilities.defined(result):
+            return result
+        type_str_ = typeof(data, self.type)
+        try:
+            decoder = self._decoders[type_str_]
+        except KeyError:
+            decoder = self._decoders[type_str_] = _compile_decoder(self, type_str_)
+        return decoder(data)
+    
+    def _decode_builtin(self, data):
+        data = dataof(data)
+        
+        if is_primitive(data):
+            return data
+        
+        if is_sequence(data):
+            item = self.item()
+            return type(data)(item._decode(value) for value in data)
+        
+        if is_mapping(data):
+            item = self.item
+            return type(data)((key, item(key)._decode(value)) for key, value in data.items())
+        
+        raise ValueError(type(data).__name__)
+
+
 class View(object):
+    __slots__ = ("_value", "_codec")
+    
     def __init__(self, value, codec):
         super().__init__()
         
-        with direct_access(self):
-            self._value = value
-            self._codec = codec
+        object.__setattr__(self, "_value", value)
+        object.__setattr__(self, "_codec", codec)
         
     def __getattr__(self, key):
         codec = self._codec.attr(key)
@@ -223,6 +600,93 @@ class View(object):
         return str(self._value)
 
 
+class DeferredView(View):
+    __slots__ = ()
+    
+    def __setattr__(self, key, value):
+        codec = self._codec.attr(key)
+        accessors.setattr(self._value, key, DeferredEncode(value, codec, codec._encoder))
+    
+    def __setitem__(self, key, value):
+        codec = self._codec.item(key)
+        accessors.setitem(self._value, key, DeferredEncode(value, codec, codec._encoder))
+    
+    def insert(self, key, value):
+        codec = self._codec.item(key)
+        self._value.insert(key, DeferredEncode(value, codec, codec._encoder))
+
+
+class DeferredList(list):
+    def __init__(self, data, codec):
+        super().__init__()
+        
+        self._data = data
+        self._codec = codec
+    
+    def __iter__(self):
+        codec = self._codec.item()
+        for value in self._data:
+            yield DeferredEncode(value, codec)
+    
+    def __len__(self):
+        return len(self._data)
+
+
+class DeferredDict(dict):
+    def __init__(self, data, codec):
+        super().__init__()
+        
+        self._data = data
+        self._codec = codec
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def keys(self):
+        return self._data.keys()
+    
+    def items(self):
+        item = self._codec.item
+        for key, value in self._data.items():
+            yield key, DeferredEncode(value, item(key))
+
+
+class DeferredEncode(object):
+    """
+    Value to be encoded one level at a time, while it is being written.
+    """
+    
+    __slots__ = ("value", "codec", "encoder")
+    
+    def __init__(self, value, codec, encoder=utilities.identity):
+        self.value = value
+        self.codec = codec
+        self.encoder = encoder
+    
+    def encode(self):
+        data = self.encoder(self.value)
+        type_ = type(data)
+        type_str_ = None if type_ is self.codec.type else type_
+        type_str_ = type_to_str(type_str_)
+        getstate = accessors.getattr(type_, "__getstate__", None)
+        if getstate is not None:
+            return dataof(_encode_state(data, getstate, type_str_, self.codec, DeferredView))
+        
+        if is_primitive(data):
+            return data
+        
+        if is_sequence(data):
+            return DeferredList(data, self.codec)
+        
+        if is_mapping(data):
+            return DeferredDict(data, self.codec)
+        
+        raise ValueError(type(data).__name__)
+
+
 def dataof(obj):
     if isinstance(obj, Object):
         return obj._data
@@ -250,7 +714,7 @@ getitems = itemsof
 
 def setdata(obj, value):
     if isinstance(obj, Object):
-        obj.__dict__["_data"] = value
+        object.__setattr__(obj, "_data", value)
     if isinstance(obj, View):
         setdata(obj._value, value)
 
@@ -329,19 +793,37 @@ def copystate(lhs, rhs, setparent=False):
                 accessors.setitem(lhs, key, value)
 
 
+def _instance_dict(obj):
+    try:
+        return object.__getattribute__(obj, "__dict__")
+    except AttributeError:
+        return {}
+
+
+def _new_object(cls, data, state=None):
+    result = cls.__new__(cls)
+    object.__setattr__(result, "_data", data)
+    if state is not None:
+        _instance_dict(result).update(state)
+    return result
+
+
 class Object(object):
+    __slots__ = ("_data", "__weakref__")
+    
     _type_key = defaults.DEFAULT_OBJECTS_TYPE_KEY
     _attrs_key = defaults.DEFAULT_OBJECTS_ATTRS_KEY
     _items_key = defaults.DEFAULT_OBJECTS_ITEMS_KEY
+    _id_key = defaults.DEFAULT_OBJECTS_ID_KEY
+    _ref_key = defaults.DEFAULT_OBJECTS_REF_KEY
     
     def __init__(self, type=None, attrs=None, items=None, data=None):
         super().__init__()
         
-        with direct_access(self):
-            self._data = {
-                self._attrs_key: {} if attrs is None else attrs,
-                self._items_key: {} if items is None else items,
-            } if data is None else data
+        object.__setattr__(self, "_data", {
+            self._attrs_key: {} if attrs is None else attrs,
+            self._items_key: {} if items is None else items,
+        } if data is None else data)
         
         if type is not None:
             accessors.setitem(self._data, self._type_key, type)
@@ -356,6 +838,9 @@ class Object(object):
             if _items is not items:
                 _items.update(items)
     
+    def __reduce__(self):
+        return (_new_object, (type(self), self._data, _instance_dict(self) or None))
+    
     def __getstate__(self, state):
         copystate(state, self, False)
         
@@ -373,8 +858,8 @@ class Object(object):
         _property = getattr(self.__class__, key, None)
         if isinstance(_property, property) and _property.fset:
             _property.fset(self, value)
-        elif key in self.__dict__:
-            accessors.setitem(self.__dict__, key, value)
+        elif isinstance(_property, types.MemberDescriptorType) or key in _instance_dict(self):
+            object.__setattr__(self, key, value)
         else:
             attrs = attrsof(self, dataof(self))
             accessors.setitem(attrs, key, value)
@@ -383,8 +868,8 @@ class Object(object):
         _property = getattr(self.__class__, key, None)
         if isinstance(_property, property) and _property.fdel:
             _property.fdel(self)
-        elif key in self.__dict__:
-            accessors.delitem(self.__dict__, key)
+        elif isinstance(_property, types.MemberDescriptorType) or key in _instance_dict(self):
+            object.__delattr__(self, key)
         else:
             attrs = attrsof(self, dataof(self))
             accessors.delitem(attrs, key)
@@ -451,7 +936,90 @@ class Object(object):
     def __str__(self):
         return "{}{}".format(type(self).__name__, str(self._data))
 
+
+
+
+class TrackedObject(Object):
+    """
+    Object that marks itself and its ancestors dirty when mutated, so clean subtrees can reuse their saved fragments.
+    """
+    
+    __slots__ = ("_parent", "_dirty", "_fragment")
+    
+    def __init__(self, *args, **kwargs):
+        _init_tracked(self)
+        
+        super().__init__(*args, **kwargs)
         
+        _adopt(self, dataof(self))
+    
+    def __reduce__(self):
+        return (_new_tracked, (type(self), self._data, _instance_dict(self) or None))
+    
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if not isinstance(getattr(type(self), key, None), types.MemberDescriptorType):
+            touch(_adopt(_holder(self, Object._attrs_key), value))
+    
+    def __delattr__(self, key):
+        super().__delattr__(key)
+        touch(_holder(self, Object._attrs_key))
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        touch(_adopt(_holder(self, Object._items_key), value))
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        touch(_holder(self, Object._items_key))
+    
+    def insert(self, key, value):
+        super().insert(key, value)
+        touch(_adopt(_holder(self, Object._items_key), value))
+
+
+def _init_tracked(obj):
+    object.__setattr__(obj, "_parent", None)
+    object.__setattr__(obj, "_dirty", True)
+    object.__setattr__(obj, "_fragment", None)
+
+
+def _new_tracked(cls, data, state=None):
+    result = _new_object(cls, data, state)
+    _init_tracked(result)
+    _adopt(result, data)
+    return result
+
+
+def _holder(obj, key):
+    child = accessors.getitem(dataof(obj), key, None)
+    return child if isinstance(child, TrackedObject) else obj
+
+
+def _adopt(parent, value):
+    if isinstance(value, TrackedObject):
+        object.__setattr__(value, "_parent", weakref.ref(parent))
+    elif isinstance(value, Object):
+        pass
+    elif is_mapping(value):
+        for item in value.values():
+            _adopt(parent, item)
+    elif is_sequence(value) and not is_primitive(value):
+        for item in value:
+            _adopt(parent, item)
+    return parent
+
+
+def touch(obj):
+    while obj is not None and not obj._dirty:
+        object.__setattr__(obj, "_dirty", True)
+        obj = obj._parent() if obj._parent is not None else None
+
+
+def isdirty(obj):
+    return not isinstance(obj, TrackedObject) or obj._dirty
+
+
 def simple_decode(cls):    
     def _decode(obj):
         result = cls()
@@ -492,6 +1060,12 @@ class ObjectJSONEncoder(json.JSONEncoder):
         if isinstance(obj, Object):
             return dataof(obj)
         
+        if isinstance(obj, DeferredEncode):
+            return obj.encode()
+        
+        if isinstance(obj, containers.BlockedList):
+            return list(obj)
+        
         return json.JSONEncoder.default(self, obj)
 
 
@@ -499,9 +1073,10 @@ class ObjectJSONDecoder(json.JSONDecoder):
     def __init__(self, *args, **kwargs):
         object_hook = kwargs.pop("object_hook", utilities.identity)
         object_pairs_hook = kwargs.pop("object_pairs_hook", dict)
+        object_type = kwargs.pop("object_type", Object)
         
         def _object_hook(data):
-            return Object(data=data)
+            return object_type(data=data)
         
         kwargs["object_hook"] = lambda data: _object_hook(object_hook(data))
         kwargs["object_pairs_hook"] = lambda data: _object_hook(object_pairs_hook(data))
@@ -529,24 +1104,296 @@ def load_file_raw(file, *args, **kwargs):
     return json.load(file, *args, **kwargs)
 
 
-def save(value, codec, *args, **kwargs):
-    data = codec.encode(value)
+class JSONStreamScanner(object):
+    _delimiters = (",", ":", "]", "}")
+    
+    def __init__(self, file, decoder, size=None):
+        super().__init__()
+        
+        self._file = file
+        self._decoder = decoder
+        self._size = defaults.DEFAULT_OBJECTS_BUFFER_SIZE if size is None else size
+        self._buffer = ""
+        self._pos = 0
+    
+    def _fill(self):
+        # Grow reads with the pending data, so values spanning many reads are rescanned O(log n) times.
+        data = self._file.read(max(self._size, len(self._buffer) - self._pos))
+        if data:
+            self._buffer = self._buffer[self._pos:] + data
+            self._pos = 0
+        return bool(data)
+    
+    def _error(self, msg):
+        return ValueError("{}: char {}".format(msg, self._pos))
+    
+    def peek(self):
+        while True:
+            self._pos = json.decoder.WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise self._error("Expecting one of {!r}".format(chars))
+        self._pos += 1
+        return char
+    
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # A value not followed by a delimiter may be truncated (e.g. a number) and continue in the next read.
+            pos = json.decoder.WHITESPACE.match(self._buffer, end).end()
+            if self._buffer[pos:pos + 1] in self._delimiters or not self._fill():
+                self._pos = end
+                return value
+    
+    def items(self):
+        start = self.expect("[{")
+        stop = "]" if start == "[" else "}"
+        
+        if self.peek() == stop:
+            self.expect(stop)
+        else:
+            index = 0
+            while True:
+                if start == "[":
+                    key, index = index, index + 1
+                else:
+                    key = self.value()
+                    if not isinstance(key, str):
+                        raise self._error("Expecting property name")
+                    self.expect(":")
+                yield key, self.value()
+                if self.expect("," + stop) == stop:
+                    break
+        
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def iterload_file_raw(file, size=None, **kwargs):
+    cls = kwargs.pop("cls", ObjectJSONDecoder)
+    scanner = JSONStreamScanner(file, cls(**kwargs), size)
+    return scanner.items()
+
+
+def iterload_file(file, codec, size=None, **kwargs):
+    for key, value in iterload_file_raw(file, size, **kwargs):
+        value = codec.item(key)._decode(value)
+        yield value if isinstance(key, int) else (key, value)
+
+
+def iterload_path(path, codec, size=None, **kwargs):
+    with open(path, 'r') as file:
+        yield from iterload_file(file, codec, size, **kwargs)
+
+
+_JSON_SKIP_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_JSON_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_JSON_SKIP_SCALAR = re.compile(r'[^,:\[\]{}\s]+')
+
+
+class _SelectionDone(Exception):
+    pass
+
+
+class JSONSelector(object):
+    """
+    Scans a JSON document for selected paths, skipping unselected subtrees without building values.
+    """
+    
+    def __init__(self, paths, decoder):
+        super().__init__()
+        
+        self._decoder = decoder
+        self._paths = [coercions.coerce_tuple(path) for path in paths]
+        self._trie = {}
+        for index, path in enumerate(self._paths):
+            node = self._trie
+            for key in path:
+                node = node.setdefault(key, {})
+            node.setdefault(None, []).append(index)
+    
+    def _ws(self, data, pos):
+        return json.decoder.WHITESPACE.match(data, pos).end()
+    
+    def _error(self, msg, pos):
+        return ValueError("{}: char {}".format(msg, pos))
+    
+    def _skip(self, data, pos):
+        char = data[pos:pos + 1]
+        if char == '"':
+            match = _JSON_SKIP_STRING.match(data, pos)
+            if match is None:
+                raise self._error("Unterminated string", pos)
+            return match.end()
+        if char == '[' or char == '{':
+            depth = 0
+            for match in _JSON_SKIP_TOKEN.finditer(data, pos):
+                token = match.group()
+                if token == '[' or token == '{':
+                    depth += 1
+                elif token == ']' or token == '}':
+                    depth -= 1
+                    if depth == 0:
+                        return match.end()
+            raise self._error("Unterminated container", pos)
+        match = _JSON_SKIP_SCALAR.match(data, pos)
+        if match is None:
+            raise self._error("Expecting value", pos)
+        return match.end()
+    
+    def _found(self, data, pos, node, results):
+        value, end = self._decoder.raw_decode(data, pos)
+        stack = [(node, value)]
+        while stack:
+            node, value = stack.pop()
+            for key, child in node.items():
+                if key is None:
+                    for index in child:
+                        results[index] = value
+                        self._remaining -= 1
+                else:
+                    try:
+                        stack.append((child, dataof(value)[key]))
+                    except accessors.ItemErrors:
+                        pass
+        if self._remaining == 0:
+            raise _SelectionDone()
+        return end
+    
+    def _child(self, data, pos, node, results):
+        pos = self._ws(data, pos)
+        if node is None:
+            return self._skip(data, pos)
+        if None in node:
+            return self._found(data, pos, node, results)
+        return self._select(data, pos, node, results)
+    
+    def _select(self, data, pos, node, results):
+        char = data[pos:pos + 1]
+        if char == '{':
+            pos = self._ws(data, pos + 1)
+            if data[pos:pos + 1] == '}':
+                return pos + 1
+            while True:
+                if data[pos:pos + 1] != '"':
+                    raise self._error("Expecting property name", pos)
+                key, pos = json.decoder.scanstring(data, pos + 1)
+                pos = self._ws(data, pos)
+                if data[pos:pos + 1] != ':':
+                    raise self._error("Expecting ':'", pos)
+                pos = self._child(data, pos + 1, node.get(key), results)
+                pos = self._ws(data, pos)
+                char = data[pos:pos + 1]
+                if char == '}':
+                    return pos + 1
+                if char != ',':
+                    raise self._error("Expecting ',' or '}'", pos)
+                pos = self._ws(data, pos + 1)
+        if char == '[':
+            pos = self._ws(data, pos + 1)
+            if data[pos:pos + 1] == ']':
+                return pos + 1
+            index = 0
+            while True:
+                pos = self._child(data, pos, node.get(index), results)
+                pos = self._ws(data, pos)
+                char = data[pos:pos + 1]
+                if char == ']':
+                    return pos + 1
+                if char != ',':
+                    raise self._error("Expecting ',' or ']'", pos)
+                pos, index = pos + 1, index + 1
+        return self._skip(data, pos)
+    
+    def select(self, data):
+        results = [utilities.Undefined] * len(self._paths)
+        self._remaining = len(self._paths)
+        try:
+            if None in self._trie:
+                self._found(data, self._ws(data, 0), self._trie, results)
+            else:
+                self._select(data, self._ws(data, 0), self._trie, results)
+        except _SelectionDone:
+            pass
+        for path, result in zip(self._paths, results):
+            if not utilities.defined(result):
+                raise KeyError(path)
+        return results
+
+
+def select_raw(data, paths, *args, **kwargs):
+    cls = kwargs.pop("cls", ObjectJSONDecoder)
+    return JSONSelector(paths, cls(*args, **kwargs)).select(data)
+
+
+def select_codec(codec, path):
+    child = codec.item
+    for i, key in enumerate(path):
+        if key == Object._attrs_key or key == Object._items_key:
+            children = codec.attrs if key == Object._attrs_key else codec.items
+            if i == len(path) - 1:
+                return Codec(items=children)
+            child = codec.attr if key == Object._attrs_key else codec.item
+        else:
+            codec = child(key)
+            child = codec.item
+    return codec
+
+
+def save(value, codec, *args, shared=False, **kwargs):
+    with shared_encoding(shared):
+        data = codec.encode(value)
     return save_raw(data, *args, **kwargs)
 
 
-def load(data, codec, *args, **kwargs):
+def load(data, codec, *args, select=None, shared=False, **kwargs):
+    if select is not None:
+        select = [coercions.coerce_tuple(path) for path in select]
+        values = select_raw(data, select, *args, **kwargs)
+        with shared_decoding(values, shared):
+            return [select_codec(codec, path).decode(value) for path, value in zip(select, values)]
     value = load_raw(data, *args, **kwargs)
-    return codec.decode(value)
+    with shared_decoding(value, shared):
+        return codec.decode(value)
+
+
+def iterencode(value, codec, *args, **kwargs):
+    cls = kwargs.pop("cls", ObjectJSONEncoder)
+    encoder = cls(*args, **kwargs)
+    return encoder.iterencode(DeferredEncode(value, codec, codec._encoder))
 
 
-def save_file(obj, file, codec, *args, **kwargs):
-    data = codec.encode(value)
-    return save_file_raw(data, file, *args, **kwargs)
+def save_file(value, file, codec, *args, size=None, shared=False, **kwargs):
+    size = defaults.DEFAULT_OBJECTS_BUFFER_SIZE if size is None else size
+    chunks, length = [], 0
+    with shared_encoding(shared):
+        for chunk in iterencode(value, codec, *args, **kwargs):
+            chunks.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                file.write("".join(chunks))
+                chunks, length = [], 0
+    file.write("".join(chunks))
 
 
-def load_file(file, codec, *args, **kwargs):
+def load_file(file, codec, *args, select=None, shared=False, **kwargs):
+    if select is not None:
+        return load(file.read(), codec, *args, select=select, shared=shared, **kwargs)
     value = load_file_raw(file, *args, **kwargs)
-    return codec.decode(value)
+    with shared_decoding(value, shared):
+        return codec.decode(value)
 
 
 def save_path(path, data, codec, *args, **kwargs):
@@ -554,6 +1401,385 @@ def save_path(path, data, codec, *args, **kwargs):
         return save_file(data, file, codec, *args, **kwargs)
 
 
-def load_path(path, codec, *args, **kwargs):
+def load_path(path, codec, *args, mapped=False, **kwargs):
+    if mapped:
+        return map_path(path, codec, *args, **kwargs)
     with open(path, 'r') as file:
         return load_file(file, codec, *args, **kwargs)
+
+
+_JSON_MAPPED_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_JSON_MAPPED_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_JSON_MAPPED_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_JSON_MAPPED_SCALAR = re.compile(rb'[^,:\[\]{}\s]+')
+
+
+class MappedDocument(object):
+    """
+    Lazily indexed JSON array or mapping over a memory-mapped file; entries are decoded on access.
+    """
+    
+    def __init__(self, buffer, codec, start=0, end=None, cache_size=None, decoder=None, owner=None):
+        super().__init__()
+        
+        self._buffer = buffer
+        self._codec = codec
+        self._start = start
+        self._end = len(buffer) if end is None else end
+        self._cache_size = defaults.DEFAULT_OBJECTS_MAPPED_CACHE_SIZE if cache_size is None else cache_size
+        self._cache = mappings.LRUMap(maxsize=self._cache_size)
+        self._decoder = ObjectJSONDecoder() if decoder is None else decoder
+        self._owner = owner
+        
+        self._pos = self._ws(start)
+        char = self._buffer[self._pos:self._pos + 1]
+        if char not in (b'[', b'{'):
+            raise self._error("Expecting '[' or '{'", self._pos)
+        self._stop = b']' if char == b'[' else b'}'
+        self._pos = self._ws(self._pos + 1)
+        self._complete = self._buffer[self._pos:self._pos + 1] == self._stop
+        
+        self._keys = []
+        self._spans = {}
+    
+    def _ws(self, pos):
+        return _JSON_MAPPED_WHITESPACE.match(self._buffer, pos, self._end).end()
+    
+    def _error(self, msg, pos):
+        return ValueError("{}: byte {}".format(msg, pos))
+    
+    def _skip(self, pos):
+        char = self._buffer[pos:pos + 1]
+        if char == b'"':
+            match = _JSON_MAPPED_STRING.match(self._buffer, pos, self._end)
+            if match is None:
+                raise self._error("Unterminated string", pos)
+            return match.end()
+        if char == b'[' or char == b'{':
+            depth = 0
+            for match in _JSON_MAPPED_TOKEN.finditer(self._buffer, pos, self._end):
+                token = match.group()
+                if token == b'[' or token == b'{':
+                    depth += 1
+                elif token == b']' or token == b'}':
+                    depth -= 1
+                    if depth == 0:
+                        return match.end()
+            raise self._error("Unterminated container", pos)
+        match = _JSON_MAPPED_SCALAR.match(self._buffer, pos, self._end)
+        if match is None:
+            raise self._error("Expecting value", pos)
+        return match.end()
+    
+    def _advance(self):
+        pos = self._pos
+        if self._stop == b'}':
+            end = self._skip(pos)
+            key = json.loads(self._buffer[pos:end].decode("utf-8"))
+            if not isinstance(key, str):
+                raise self._error("Expecting property name", pos)
+            pos = self._ws(end)
+            if self._buffer[pos:pos + 1] != b':':
+                raise self._error("Expecting ':'", pos)
+            pos = self._ws(pos + 1)
+        else:
+            key = len(self._keys)
+        
+        end = self._skip(pos)
+        self._keys.append(key)
+        self._spans[key] = (pos, end)
+        
+        pos = self._ws(end)
+        char = self._buffer[pos:pos + 1]
+        if char == self._stop:
+            self._complete = True
+        elif char != b',':
+            raise self._error("Expecting ',' or {!r}".format(self._stop.decode()), pos)
+        self._pos = self._ws(pos + 1)
+    
+    def _span(self, key):
+        while key not in self._spans and not self._complete:
+            self._advance()
+        try:
+            return self._spans[key]
+        except KeyError:
+            raise KeyError(key)
+    
+    def _index(self):
+        while not self._complete:
+            self._advance()
+    
+    def _normalize(self, key):
+        if self._stop == b']' and isinstance(key, int) and key < 0:
+            self._index()
+            key += len(self._keys)
+        return key
+    
+    def raw(self, key):
+        start, end = self._span(self._normalize(key))
+        return self._decoder.decode(self._buffer[start:end].decode("utf-8"))
+    
+    def child(self, key):
+        key = self._normalize(key)
+        start, end = self._span(key)
+        return type(self)(self._buffer, self._codec.item(key), start, end, self._cache_size, self._decoder, self)
+    
+    def __getitem__(self, key):
+        key = self._normalize(key)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = self._codec.item(key)._decode(self.raw(key))
+        if self._cache_size:
+            self._cache[key] = value
+        return value
+    
+    def __contains__(self, key):
+        try:
+            self._span(self._normalize(key))
+        except KeyError:
+            return False
+        return True
+    
+    def __len__(self):
+        self._index()
+        return len(self._keys)
+    
+    def __iter__(self):
+        return self.keys()
+    
+    def get(self, key, default=None):
+        return accessors.getitem(self, key, default)
+    
+    def keys(self):
+        i = 0
+        while True:
+            while i >= len(self._keys) and not self._complete:
+                self._advance()
+            if i >= len(self._keys):
+                return
+            yield self._keys[i]
+            i += 1
+    
+    def values(self):
+        for key in self.keys():
+            yield self[key]
+    
+    def items(self):
+        for key in self.keys():
+            yield key, self[key]
+    
+    def close(self):
+        if self._owner is None:
+            self._buffer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def __repr__(self):
+        return "{}[{}:{}]".format(type(self).__name__, self._start, self._end)
+
+
+def map_path(path, codec, cache_size=None, **kwargs):
+    cls = kwargs.pop("cls", ObjectJSONDecoder)
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return MappedDocument(buffer, codec, cache_size=cache_size, decoder=cls(**kwargs))
+    except Exception:
+        buffer.close()
+        raise
+
+
+class IncrementalJSONEncoder(ObjectJSONEncoder):
+    """
+    Compact encoder that caches the text of clean TrackedObject subtrees and re-encodes only dirty ones.
+    Cached text is keyed on the encoder options, so saving with different options re-encodes.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("separators", (", ", ": "))
+        if kwargs.get("indent") is not None:
+            raise ValueError("Incremental encoding does not support indent.")
+        
+        super().__init__(*args, **kwargs)
+        
+        self._options = (self.sort_keys, self.ensure_ascii, self.allow_nan, self.item_separator, self.key_separator, self.default)
+    
+    def _key(self, key):
+        if not isinstance(key, str):
+            key = super().encode(key)
+        return super().encode(key)
+    
+    def _encode(self, value):
+        if isinstance(value, TrackedObject):
+            fragment = value._fragment
+            if value._dirty or fragment is None or fragment[0] != self._options:
+                fragment = (self._options, self._encode(dataof(value)))
+                object.__setattr__(value, "_fragment", fragment)
+                object.__setattr__(value, "_dirty", False)
+            return fragment[1]
+        
+        value = dataof(value)
+        
+        if is_mapping(value):
+            items = sorted(value.items()) if self.sort_keys else value.items()
+            return "{" + self.item_separator.join(self._key(key) + self.key_separator + self._encode(item) for key, item in items) + "}"
+        
+        if isinstance(value, (list, tuple)):
+            return "[" + self.item_separator.join(self._encode(item) for item in value) + "]"
+        
+        return super().encode(value)
+    
+    def encode(self, value):
+        return self._encode(value)
+
+
+def save_incremental(data, *args, **kwargs):
+    kwargs.setdefault("cls", IncrementalJSONEncoder)
+    return save_raw(data, *args, **kwargs)
+
+
+def save_incremental_file(data, file, *args, **kwargs):
+    return file.write(save_incremental(data, *args, **kwargs))
+
+
+def save_incremental_path(path, data, *args, **kwargs):
+    with open(path, 'w') as file:
+        return save_incremental_file(data, file, *args, **kwargs)
+
+
+def load_tracked(data, *args, **kwargs):
+    kwargs.setdefault("object_type", TrackedObject)
+    return load_raw(data, *args, **kwargs)
+
+
+def load_tracked_file(file, *args, **kwargs):
+    kwargs.setdefault("object_type", TrackedObject)
+    return load_file_raw(file, *args, **kwargs)
+
+
+def load_tracked_path(path, *args, **kwargs):
+    with open(path, 'r') as file:
+        return load_tracked_file(file, *args, **kwargs)
+
+
+class _PassCodec(object):
+    type = None
+    
+    def attr(self, key=None):
+        return self
+    
+    def item(self, key=None):
+        return self
+    
+    def encode(self, data):
+        return data
+    
+    def decode(self, data):
+        return data
+
+_pass_codec = _PassCodec()
+
+
+def _is_stateful(type_):
+    def _takes_state(func):
+        return isinstance(func, types.FunctionType) and func.__code__.co_argcount == 2
+    getstate = accessors.getattr(type_, "__getstate__", None)
+    setstate = accessors.getattr(type_, "__setstate__", None)
+    return _takes_state(getstate) and _takes_state(setstate)
+
+
+def _restore_stateful(cls, state):
+    result = cls()
+    cls.__setstate__(result, View(state, _pass_codec))
+    return result
+
+
+def _reduce_stateful(obj):
+    state = Object()
+    type(obj).__getstate__(obj, View(state, _pass_codec))
+    return (_restore_stateful, (type(obj), state))
+
+
+class _StatefulDispatch(object):
+    def get(self, type_, default=None):
+        if not issubclass(type_, Object) and _is_stateful(type_):
+            return _reduce_stateful
+        return copyreg.dispatch_table.get(type_, default)
+    
+    def __getitem__(self, type_):
+        result = self.get(type_)
+        if result is None:
+            raise KeyError(type_)
+        return result
+
+
+class ObjectPickler(pickle.Pickler):
+    """
+    Pickles types implementing __getstate__(self, state)/__setstate__(self, state) through a View.
+    """
+    
+    dispatch_table = _StatefulDispatch()
+
+
+class _PickledList(list):
+    def __reduce__(self):
+        file = io.BytesIO()
+        ObjectPickler(file, pickle.HIGHEST_PROTOCOL).dump(list(self))
+        return (pickle.loads, (file.getvalue(),))
+
+
+def _load_document(document, codec, kwargs):
+    # Text is a document; paths are os.PathLike so they can never be mistaken for JSON.
+    if isinstance(document, os.PathLike):
+        return load_path(document, codec, **kwargs)
+    return load(document, codec, **kwargs)
+
+
+def _load_chunk(chunk, codec, kwargs):
+    return _PickledList(_load_document(document, codec, kwargs) for document in chunk)
+
+
+def _save_chunk(chunk, codec, kwargs):
+    return [save(value, codec, **kwargs) for value in chunk]
+
+
+def _save_path_chunk(chunk, codec, kwargs):
+    return [save_path(path, value, codec, **kwargs) or path for value, path in chunk]
+
+
+def _map_chunks(func, iterable, executor=None, chunksize=1, maxpending=None):
+    chunks = iterables.chunked(iterable, chunksize)
+    
+    if executor is None:
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+    
+    maxpending = 2 * (os.cpu_count() or 1) if maxpending is None else maxpending
+    pending = collections.deque()
+    for chunk in chunks:
+        if len(pending) >= maxpending:
+            yield from pending.popleft().result()
+        pending.append(executor.submit(func, _PickledList(chunk)))
+    while pending:
+        yield from pending.popleft().result()
+
+
+def load_many(documents, codec, executor=None, chunksize=1, maxpending=None, **kwargs):
+    func = ft.partial(_load_chunk, codec=codec, kwargs=kwargs)
+    return _map_chunks(func, documents, executor, chunksize, maxpending)
+
+
+def save_many(values, codec, paths=None, executor=None, chunksize=1, maxpending=None, **kwargs):
+    if paths is None:
+        func = ft.partial(_save_chunk, codec=codec, kwargs=kwargs)
+        return _map_chunks(func, values, executor, chunksize, maxpending)
+    
+    func = ft.partial(_save_path_chunk, codec=codec, kwargs=kwargs)
+    return _map_chunks(func, zip(values, paths), executor, chunksize, maxpending)